@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import orjson
 from datetime import datetime
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 from fastapi.encoders import jsonable_encoder
@@ -22,7 +23,7 @@ async def event_generator(db: AsyncSession):
         try:
             signals = await svc.get_active_signals(limit=10)
             for s in signals:
-                yield f"data: {json.dumps(s, default=str)}\n\n"
+                yield f"data: {orjson.dumps(s).decode()}\n\n"
             # heartbeat if no signals
             if not signals:
                 yield f"data: {json.dumps({'heartbeat': datetime.utcnow().isoformat()+'Z'})}\n\n"
@@ -9,7 +9,7 @@ import json
 import structlog
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field
-from ...services.secure_credential_manager import credential_manager, ExchangeCredentials
+from ...services.secure_credential_manager import get_credential_manager, ExchangeCredentials
 from ...services.secure_trading_engine import trading_engine, OrderRequest, OrderResult, Balance, Position
 
 logger = structlog.get_logger()
@@ -82,7 +82,7 @@ async def store_credentials(
     """Store encrypted exchange credentials"""
     try:
         # Validate exchange
-        if credentials.exchange not in credential_manager.supported_exchanges:
+        if credentials.exchange not in get_credential_manager().supported_exchanges:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Unsupported exchange: {credentials.exchange}"
@@ -100,7 +100,7 @@ async def store_credentials(
         )
         
         # Store credentials
-        success = await credential_manager.store_credentials(creds)
+        success = await get_credential_manager().store_credentials(creds)
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to store credentials")
@@ -115,7 +115,7 @@ async def store_credentials(
 async def get_credentials(user_id: str = Depends(get_user_id)):
     """Get all stored credentials (without sensitive data)"""
     try:
-        credentials = await credential_manager.get_all_credentials(user_id)
+        credentials = await get_credential_manager().get_all_credentials(user_id)
         
         # Return only non-sensitive information
         result = []
@@ -141,7 +141,7 @@ async def verify_credentials(
 ):
     """Verify stored credentials by making a test API call"""
     try:
-        success = await credential_manager.verify_credentials(user_id, exchange)
+        success = await get_credential_manager().verify_credentials(user_id, exchange)
         
         if success:
             return {"message": "Credentials verified successfully"}
@@ -159,7 +159,7 @@ async def delete_credentials(
 ):
     """Delete stored credentials"""
     try:
-        success = await credential_manager.delete_credentials(user_id, exchange)
+        success = await get_credential_manager().delete_credentials(user_id, exchange)
         
         if success:
             return {"message": "Credentials deleted successfully"}
@@ -420,8 +420,8 @@ async def get_positions(
 async def get_supported_exchanges():
     """Get list of supported exchanges"""
     return {
-        "exchanges": credential_manager.supported_exchanges,
-        "total": len(credential_manager.supported_exchanges)
+        "exchanges": get_credential_manager().supported_exchanges,
+        "total": len(get_credential_manager().supported_exchanges)
     }
 
 @router.get("/health")
@@ -431,7 +431,7 @@ async def get_trading_health():
         # Check if trading engine is initialized
         return {
             "status": "healthy",
-            "supported_exchanges": len(credential_manager.supported_exchanges),
+            "supported_exchanges": len(get_credential_manager().supported_exchanges),
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
         
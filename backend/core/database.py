@@ -3,6 +3,7 @@ Database configuration and connection management
 """
 
 from datetime import datetime
+import re
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import text
@@ -52,6 +53,90 @@ def get_async_session() -> AsyncSession:
     return AsyncSessionLocal()
 
 
+# Indexes that must be built without blocking writes on existing tables.
+# CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block, so
+# these run on an autocommit connection after the schema is in place.
+# Each group runs in order and stops at its first failure, since later
+# statements may rely on earlier ones (e.g. drop an old index after its
+# replacement exists). A failing group does not hold back the others.
+CONCURRENT_INDEX_MIGRATIONS = [
+    [
+        # Covering unique index so consume_token lookups are index-only
+        (
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS remote_access_links_token_hash_idx "
+            "ON remote_access_links (token_hash) "
+            "INCLUDE (id, uses_left, expires_at, max_uses, forward_url)"
+        ),
+        "DROP INDEX CONCURRENTLY IF EXISTS ix_remote_access_links_token_hash",
+    ],
+    [
+        # Partial covering index for the risk manager's daily PnL aggregate
+        (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_positions_updated_at_pnl "
+            "ON positions (updated_at) INCLUDE (realized_pnl, unrealized_pnl) "
+            "WHERE realized_pnl IS NOT NULL OR unrealized_pnl IS NOT NULL"
+        ),
+    ],
+    [
+        # Latest kline per (symbol, exchange) for the arbitrage strategy; a
+        # backward scan of open_time serves the DESC ordering
+        (
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_klines_symbol_exchange_open_time "
+            "ON klines (symbol, exchange, open_time)"
+        ),
+    ],
+]
+
+
+EXCHANGE_CREDENTIALS_BYTEA_MIGRATION = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'exchange_credentials' AND column_name = 'api_key' AND data_type <> 'bytea'
+    ) THEN
+        ALTER TABLE exchange_credentials
+            ALTER COLUMN api_key TYPE bytea USING CASE WHEN api_key LIKE 'v2:%' THEN '\\x02'::bytea || decode(substr(api_key, 4), 'base64') ELSE convert_to(api_key, 'UTF8') END,
+            ALTER COLUMN secret_key TYPE bytea USING CASE WHEN secret_key LIKE 'v2:%' THEN '\\x02'::bytea || decode(substr(secret_key, 4), 'base64') ELSE convert_to(secret_key, 'UTF8') END,
+            ALTER COLUMN passphrase TYPE bytea USING CASE WHEN passphrase LIKE 'v2:%' THEN '\\x02'::bytea || decode(substr(passphrase, 4), 'base64') ELSE convert_to(passphrase, 'UTF8') END;
+    END IF;
+END $$
+"""
+
+_CONCURRENT_CREATE_INDEX = re.compile(r"CREATE (?:UNIQUE )?INDEX CONCURRENTLY IF NOT EXISTS (\w+)")
+
+_INDEX_IS_VALID = text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)")
+
+
+async def _index_is_valid(conn, name: str):
+    """pg_index.indisvalid for an index, or None when it does not exist"""
+    return (await conn.execute(_INDEX_IS_VALID, {"name": name})).scalar()
+
+
+async def _apply_concurrent_index_migrations():
+    """Apply CONCURRENT_INDEX_MIGRATIONS outside of a transaction
+
+    An interrupted concurrent build leaves an INVALID index behind that
+    IF NOT EXISTS would silently accept, so such leftovers are dropped and
+    rebuilt, and a group stops unless the index it just built is valid.
+    """
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for group in CONCURRENT_INDEX_MIGRATIONS:
+            for statement in group:
+                created = _CONCURRENT_CREATE_INDEX.match(statement)
+                try:
+                    if created and await _index_is_valid(conn, created.group(1)) is False:
+                        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {created.group(1)}"))
+                    await conn.execute(text(statement))
+                    if created and not await _index_is_valid(conn, created.group(1)):
+                        logger.error("Index migration left an invalid index", statement=statement)
+                        break
+                except Exception as e:
+                    logger.error("Index migration failed", statement=statement, error=str(e))
+                    break
+
+
 async def init_db():
     """Initialize database tables"""
     try:
@@ -86,6 +171,14 @@ async def init_db():
             except Exception as e:
                 logger.error("Migration failed: users verification columns", error=str(e))
 
+            # Encrypted exchange credentials are raw bytes ("\x02" + AES-GCM nonce
+            # + ciphertext); legacy Fernet tokens keep their ASCII form
+            try:
+                async with conn.begin_nested():
+                    await conn.execute(text(EXCHANGE_CREDENTIALS_BYTEA_MIGRATION))
+            except Exception as e:
+                logger.error("Migration failed: exchange_credentials bytea columns", error=str(e))
+
             # Seed blog posts if table is empty to ensure blog section has content
             try:
                 result = await conn.execute(text("SELECT COUNT(*) FROM blog_posts"))
@@ -150,6 +243,8 @@ async def init_db():
                     logger.info("Seeded default blog posts", count=len(seed_posts))
             except Exception as e:
                 logger.error("Failed to seed blog posts", error=str(e))
+
+        await _apply_concurrent_index_migrations()
     except Exception as e:
         logger.error("Failed to initialize database", error=str(e))
         raise
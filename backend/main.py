@@ -4,6 +4,7 @@ Main application entry point
 """
 
 from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
@@ -92,6 +93,9 @@ async def lifespan(app: FastAPI):
             logger.error("Failed to stop market stream forwarder", error=str(forward_error))
     await ultra_oracle.stop()
 
+    from services.signals import close_http_session
+    await close_http_session()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -100,6 +104,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
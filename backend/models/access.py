@@ -11,7 +11,7 @@ class RemoteAccessLink(Base):
     __tablename__ = "remote_access_links"
 
     id = Column(Integer, primary_key=True, index=True)
-    token_hash = Column(String(128), nullable=False, unique=True, index=True)
+    token_hash = Column(String(128), nullable=False)
     encrypted_token = Column(String(512), nullable=False)
     label = Column(String(100), nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -27,4 +27,10 @@ class RemoteAccessLink(Base):
 
     __table_args__ = (
         Index('idx_remote_access_creator', 'created_by'),
+        Index(
+            'remote_access_links_token_hash_idx',
+            'token_hash',
+            unique=True,
+            postgresql_include=['id', 'uses_left', 'expires_at', 'max_uses', 'forward_url'],
+        ),
     )
@@ -47,6 +47,8 @@ class Kline(Base):
     __table_args__ = (
         Index('idx_symbol_interval_time', 'symbol', 'interval', 'open_time'),
         Index('idx_exchange_symbol_interval', 'exchange', 'symbol', 'interval'),
+        # Newest kline per (symbol, exchange) for StrategyEngine._latest_prices
+        Index('ix_klines_symbol_exchange_open_time', 'symbol', 'exchange', 'open_time'),
     )
 
 
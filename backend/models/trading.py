@@ -9,7 +9,7 @@ from typing import Optional
 
 from sqlalchemy import (
     Boolean, Column, DateTime, Enum as SQLEnum, ForeignKey, 
-    Integer, Numeric, String, Text, Index
+    Integer, Numeric, String, Text, Index, text
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -162,6 +162,13 @@ class Position(Base):
     __table_args__ = (
         Index('idx_positions_symbol_exchange', 'symbol', 'exchange'),
         Index('idx_positions_active_mode', 'is_active', 'mode'),
+        # Serves the daily PnL aggregate in RiskManager._check_daily_limits
+        Index(
+            'ix_positions_updated_at_pnl',
+            'updated_at',
+            postgresql_include=['realized_pnl', 'unrealized_pnl'],
+            postgresql_where=text('realized_pnl IS NOT NULL OR unrealized_pnl IS NOT NULL'),
+        ),
     )
 
 
@@ -34,6 +34,9 @@ class SignalResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    class Config:
+        from_attributes = True
+
 
 class AlertCreate(BaseModel):
     user_id: str
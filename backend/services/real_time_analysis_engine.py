@@ -4,20 +4,136 @@ Computes technical indicators and trading signals in real-time
 """
 
 import asyncio
-import json
+import concurrent.futures
 import time
+import orjson
+from collections import defaultdict, deque
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 import structlog
 import redis.asyncio as redis
 from prometheus_client import Counter, Gauge, Histogram
 import os
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the fused kernel also runs as plain Python
+    njit = None
+
 logger = structlog.get_logger()
 
+# Ingestion publishes "{epoch_sec},{price}" on this channel prefix for every new tick
+TICK_CHANNEL_PREFIX = "rt:tick:"
+
+# Output layout of the fused indicator kernel
+INDICATOR_KEYS = (
+    "sma_20", "sma_50", "ema_12", "ema_26", "rsi_14",
+    "macd", "signal", "histogram",
+    "upper", "middle", "lower",
+    "k", "d", "atr_14",
+    "price", "price_change_1h", "price_change_4h", "price_change_24h",
+)
+
+def _fused_indicators(x, out):
+    """Compute every indicator in INDICATOR_KEYS in a single pass over x.
+
+    x must hold at least 20 prices. Results are written into out.
+    """
+    n = len(x)
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+    ema12 = x[0]
+    ema26 = x[0]
+    sig = 0.0
+    # Bollinger sums are taken relative to the last price to limit cancellation
+    shift = x[n - 1]
+    sum20 = 0.0
+    sumsq20 = 0.0
+    sum50 = 0.0
+    gain14 = 0.0
+    loss14 = 0.0
+    hi14 = x[n - 1]
+    lo14 = x[n - 1]
+    
+    for i in range(n):
+        v = x[i]
+        if i > 0:
+            ema12 = (v * a12) + (ema12 * (1 - a12))
+            ema26 = (v * a26) + (ema26 * (1 - a26))
+            sig = ((ema12 - ema26) * a9) + (sig * (1 - a9))
+            if i >= n - 14:
+                delta = v - x[i - 1]
+                if delta > 0:
+                    gain14 += delta
+                else:
+                    loss14 -= delta
+        if i >= n - 20:
+            dv = v - shift
+            sum20 += dv
+            sumsq20 += dv * dv
+        if i >= n - 50:
+            sum50 += v
+        if i >= n - 14:
+            if v > hi14:
+                hi14 = v
+            if v < lo14:
+                lo14 = v
+    
+    price = x[n - 1]
+    
+    # Moving averages
+    mean_dev20 = sum20 / 20
+    sma20 = shift + mean_dev20
+    out[0] = sma20
+    out[1] = sum50 / 50 if n >= 50 else 0.0
+    out[2] = ema12
+    out[3] = ema26 if n >= 26 else 0.0
+    
+    # RSI
+    if loss14 == 0:
+        out[4] = 100.0
+    else:
+        out[4] = 100 - (100 / (1 + gain14 / loss14))
+    
+    # MACD
+    if n >= 26:
+        macd = ema12 - ema26
+        out[5] = macd
+        out[6] = sig
+        out[7] = macd - sig
+    else:
+        out[5] = 0.0
+        out[6] = 0.0
+        out[7] = 0.0
+    
+    # Bollinger Bands
+    variance = sumsq20 / 20 - mean_dev20 * mean_dev20
+    std = np.sqrt(variance) if variance > 0 else 0.0
+    out[8] = sma20 + std * 2
+    out[9] = sma20
+    out[10] = sma20 - std * 2
+    
+    # Stochastic
+    k = 50.0 if hi14 == lo14 else ((price - lo14) / (hi14 - lo14)) * 100
+    out[11] = k
+    out[12] = k
+    
+    # ATR (close-to-close true range)
+    out[13] = (gain14 + loss14) / 14
+    
+    # Price-based indicators
+    out[14] = price
+    out[15] = ((price - x[n - 12]) / x[n - 12] * 100) if n >= 12 else 0.0
+    out[16] = ((price - x[n - 48]) / x[n - 48] * 100) if n >= 48 else 0.0
+    out[17] = ((price - x[n - 288]) / x[n - 288] * 100) if n >= 288 else 0.0
+
+if njit is not None:
+    _fused_indicators = njit(cache=True, fastmath=True)(_fused_indicators)
+
 @dataclass
 class TechnicalIndicator:
     symbol: str
@@ -26,7 +142,7 @@ class TechnicalIndicator:
     timestamp: float
     parameters: Dict[str, Any]
 
-@dataclass
+@dataclass(slots=True)
 class TradingSignal:
     symbol: str
     signal_type: str
@@ -36,67 +152,92 @@ class TradingSignal:
     timestamp: float
     indicators: Dict[str, float]
     description: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict view for serialization (cheaper than dataclasses.asdict)"""
+        return {
+            "symbol": self.symbol,
+            "signal_type": self.signal_type,
+            "strength": self.strength,
+            "direction": self.direction,
+            "price": self.price,
+            "timestamp": self.timestamp,
+            "indicators": self.indicators,
+            "description": self.description,
+        }
 
-class RealTimeAnalysisEngine:
-    def __init__(self):
-        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        self.redis = redis.from_url(self.redis_url, decode_responses=True)
-        
-        # Analysis parameters
-        self.price_window = 100  # Number of price points for analysis
-        self.analysis_interval = 5  # Analysis interval in seconds
-        self.signal_threshold = 0.6  # Minimum signal strength
-        
-        # Metrics
-        self.indicators_computed = Counter("indicators_computed_total", "Technical indicators computed", ["symbol", "indicator_type"])
-        self.signals_generated = Counter("signals_generated_total", "Trading signals generated", ["symbol", "signal_type"])
-        self.analysis_latency = Histogram("analysis_latency_seconds", "Analysis processing time", ["symbol"])
-        self.active_symbols = Gauge("active_analysis_symbols", "Number of symbols being analyzed")
-        
-        # Data storage
-        self.price_data: Dict[str, List[float]] = {}
-        self.indicators: Dict[str, Dict[str, float]] = {}
-        self.signals: Dict[str, List[TradingSignal]] = {}
-        
-    async def initialize(self):
-        """Initialize the analysis engine"""
-        try:
-            await self.redis.ping()
-            logger.info("Real-time analysis engine initialized")
-        except Exception as e:
-            logger.error("Failed to initialize analysis engine", error=str(e))
-            raise
+# Indicator columns consumed by the signal rules, with their defaults when missing
+SIGNAL_COLUMNS = {
+    "price": 0.0, "rsi_14": 50.0,
+    "macd": 0.0, "signal": 0.0, "histogram": 0.0,
+    "upper": 0.0, "lower": 0.0, "middle": 0.0,
+    "sma_20": 0.0, "sma_50": 0.0,
+    "k": 50.0, "d": 50.0,
+}
+
+def _band_width(c):
+    return c["upper"] - c["lower"]
+
+# Signal rules evaluated column-wise over all symbols at once:
+# (signal_type, direction, mask, strength, indicator fields, description)
+SIGNAL_RULES = (
+    ("rsi_oversold", "buy",
+     lambda c: c["rsi_14"] < 30,
+     lambda c: (30 - c["rsi_14"]) / 30,
+     {"rsi": "rsi_14"},
+     lambda v: f"RSI oversold at {v['rsi']:.2f}"),
+    ("rsi_overbought", "sell",
+     lambda c: c["rsi_14"] > 70,
+     lambda c: (c["rsi_14"] - 70) / 30,
+     {"rsi": "rsi_14"},
+     lambda v: f"RSI overbought at {v['rsi']:.2f}"),
+    ("macd_bullish", "buy",
+     lambda c: (c["macd"] > c["signal"]) & (c["histogram"] > 0),
+     lambda c: np.abs(c["histogram"]) / c["price"] * 1000,
+     {"macd": "macd", "signal": "signal", "histogram": "histogram"},
+     lambda v: "MACD bullish crossover"),
+    ("macd_bearish", "sell",
+     lambda c: (c["macd"] < c["signal"]) & (c["histogram"] < 0),
+     lambda c: np.abs(c["histogram"]) / c["price"] * 1000,
+     {"macd": "macd", "signal": "signal", "histogram": "histogram"},
+     lambda v: "MACD bearish crossover"),
+    ("bb_oversold", "buy",
+     lambda c: (c["price"] < c["lower"]) & (_band_width(c) > 0),
+     lambda c: (c["lower"] - c["price"]) / _band_width(c),
+     {"upper_bb": "upper", "lower_bb": "lower", "middle_bb": "middle"},
+     lambda v: "Price below lower Bollinger Band"),
+    ("bb_overbought", "sell",
+     lambda c: (c["price"] > c["upper"]) & (_band_width(c) > 0),
+     lambda c: (c["price"] - c["upper"]) / _band_width(c),
+     {"upper_bb": "upper", "lower_bb": "lower", "middle_bb": "middle"},
+     lambda v: "Price above upper Bollinger Band"),
+    ("ma_bullish", "buy",
+     lambda c: (c["sma_20"] > c["sma_50"]) & (c["price"] > c["sma_20"]) & (c["sma_50"] > 0),
+     lambda c: (c["sma_20"] - c["sma_50"]) / c["sma_50"],
+     {"sma_20": "sma_20", "sma_50": "sma_50"},
+     lambda v: "Price above rising moving averages"),
+    ("ma_bearish", "sell",
+     lambda c: (c["sma_20"] < c["sma_50"]) & (c["price"] < c["sma_20"]) & (c["sma_50"] > 0),
+     lambda c: (c["sma_50"] - c["sma_20"]) / c["sma_50"],
+     {"sma_20": "sma_20", "sma_50": "sma_50"},
+     lambda v: "Price below falling moving averages"),
+    ("stoch_oversold", "buy",
+     lambda c: (c["k"] < 20) & (c["d"] < 20),
+     lambda c: (20 - c["k"]) / 20,
+     {"stoch_k": "k", "stoch_d": "d"},
+     lambda v: "Stochastic oversold"),
+    ("stoch_overbought", "sell",
+     lambda c: (c["k"] > 80) & (c["d"] > 80),
+     lambda c: (c["k"] - 80) / 20,
+     {"stoch_k": "k", "stoch_d": "d"},
+     lambda v: "Stochastic overbought"),
+)
+
+class TechnicalIndicatorCalculator:
+    """Pure indicator math, free of Redis/metrics state so it can run in worker processes"""
     
-    async def get_price_data(self, symbol: str, window: int = None) -> List[float]:
-        """Get recent price data for a symbol"""
-        try:
-            if window is None:
-                window = self.price_window
-            
-            # Get data from all exchanges
-            exchanges = ["binance", "bybit", "kucoin", "coinbase", "kraken", "okx", "gateio", "huobi"]
-            all_prices = []
-            
-            for exchange in exchanges:
-                key = f"rt:prices:{symbol}:{exchange}"
-                data = await self.redis.lrange(key, 0, window - 1)
-                
-                for item in data:
-                    try:
-                        price_data = json.loads(item)
-                        all_prices.append((price_data['timestamp'], price_data['price']))
-                    except:
-                        continue
-            
-            # Sort by timestamp and extract prices
-            all_prices.sort(key=lambda x: x[0])
-            prices = [price for _, price in all_prices[-window:]]
-            
-            return prices
-            
-        except Exception as e:
-            logger.error(f"Failed to get price data for {symbol}", error=str(e))
-            return []
+    # Kernel output buffer, allocated once per instance (i.e. once per worker process)
+    _scratch_out: Optional[np.ndarray] = None
     
     def calculate_sma(self, prices: List[float], period: int) -> float:
         """Calculate Simple Moving Average"""
@@ -117,6 +258,18 @@ class RealTimeAnalysisEngine:
         
         return ema
     
+    def calculate_ema_series(self, prices: List[float], period: int) -> List[float]:
+        """Calculate the EMA at every point of the series (seeded with the first price)"""
+        multiplier = 2 / (period + 1)
+        ema = prices[0]
+        series = [ema]
+        
+        for price in prices[1:]:
+            ema = (price * multiplier) + (ema * (1 - multiplier))
+            series.append(ema)
+        
+        return series
+    
     def calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Calculate Relative Strength Index"""
         if len(prices) < period + 1:
@@ -137,19 +290,32 @@ class RealTimeAnalysisEngine:
         
         return rsi
     
-    def calculate_macd(self, prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, float]:
-        """Calculate MACD (Moving Average Convergence Divergence)"""
+    def calculate_macd(
+        self,
+        prices: List[float],
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9,
+        ema_fast: Optional[List[float]] = None,
+        ema_slow: Optional[List[float]] = None,
+    ) -> Dict[str, float]:
+        """Calculate MACD (Moving Average Convergence Divergence)
+
+        ema_fast/ema_slow may be passed as precomputed EMA series to avoid
+        recomputing them when the caller already has them.
+        """
         if len(prices) < slow:
             return {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
         
-        ema_fast = self.calculate_ema(prices, fast)
-        ema_slow = self.calculate_ema(prices, slow)
-        
-        macd = ema_fast - ema_slow
+        if ema_fast is None:
+            ema_fast = self.calculate_ema_series(prices, fast)
+        if ema_slow is None:
+            ema_slow = self.calculate_ema_series(prices, slow)
         
-        # For signal line, we need MACD values over time
-        # This is simplified - in practice, you'd store MACD history
-        signal_line = macd  # Simplified
+        # Signal line is the EMA of the MACD series itself
+        macd_series = [f - s for f, s in zip(ema_fast, ema_slow)]
+        macd = macd_series[-1]
+        signal_line = self.calculate_ema_series(macd_series, signal)[-1]
         histogram = macd - signal_line
         
         return {
@@ -180,10 +346,10 @@ class RealTimeAnalysisEngine:
         if len(prices) < k_period:
             return {"k": 50.0, "d": 50.0}
         
-        recent_prices = prices[-k_period:]
-        highest_high = max(recent_prices)
-        lowest_low = min(recent_prices)
-        current_price = prices[-1]
+        recent_prices = np.asarray(prices[-k_period:], dtype=np.float64)
+        highest_high = float(recent_prices.max())
+        lowest_low = float(recent_prices.min())
+        current_price = float(recent_prices[-1])
         
         if highest_high == lowest_low:
             k = 50.0
@@ -224,39 +390,16 @@ class RealTimeAnalysisEngine:
         if len(prices) < 20:  # Minimum data required
             return {}
         
-        indicators = {}
-        
         try:
-            # Moving Averages
-            indicators["sma_20"] = self.calculate_sma(prices, 20)
-            indicators["sma_50"] = self.calculate_sma(prices, 50)
-            indicators["ema_12"] = self.calculate_ema(prices, 12)
-            indicators["ema_26"] = self.calculate_ema(prices, 26)
-            
-            # RSI
-            indicators["rsi_14"] = self.calculate_rsi(prices, 14)
-            
-            # MACD
-            macd_data = self.calculate_macd(prices)
-            indicators.update(macd_data)
-            
-            # Bollinger Bands
-            bb_data = self.calculate_bollinger_bands(prices)
-            indicators.update(bb_data)
-            
-            # Stochastic
-            stoch_data = self.calculate_stochastic(prices)
-            indicators.update(stoch_data)
-            
-            # ATR
-            indicators["atr_14"] = self.calculate_atr(prices)
-            
-            # Price-based indicators
-            current_price = prices[-1]
-            indicators["price"] = current_price
-            indicators["price_change_1h"] = ((current_price - prices[-12]) / prices[-12] * 100) if len(prices) >= 12 else 0
-            indicators["price_change_4h"] = ((current_price - prices[-48]) / prices[-48] * 100) if len(prices) >= 48 else 0
-            indicators["price_change_24h"] = ((current_price - prices[-288]) / prices[-288] * 100) if len(prices) >= 288 else 0
+            # Stay in float64: MACD histogram and stochastic %K are differences of
+            # nearby prices and drift by up to ~4e-3 relative error in float32
+            x = np.asarray(prices, dtype=np.float64)
+            out = self._scratch_out
+            if out is None:
+                out = self._scratch_out = np.empty(len(INDICATOR_KEYS), dtype=np.float64)
+            # Plain-Python fallback is much faster on Python floats than on NumPy scalars
+            _fused_indicators(x if njit is not None else x.tolist(), out)
+            indicators = dict(zip(INDICATOR_KEYS, out.tolist()))
             
             # Volume indicators (simplified)
             indicators["volume_sma_20"] = 0  # Would need volume data
@@ -267,228 +410,310 @@ class RealTimeAnalysisEngine:
             return {}
         
         return indicators
-    
-    def generate_trading_signals(self, symbol: str, indicators: Dict[str, float]) -> List[TradingSignal]:
-        """Generate trading signals based on technical indicators"""
-        signals = []
+
+_calculator = TechnicalIndicatorCalculator()
+
+def _compute_indicators_worker(symbol: str, prices: np.ndarray) -> Dict[str, float]:
+    """Process-pool entry point for indicator computation"""
+    return _calculator.calculate_indicators(symbol, prices)
+
+class RealTimeAnalysisEngine(TechnicalIndicatorCalculator):
+    def __init__(self):
+        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.redis = redis.from_url(self.redis_url, decode_responses=True)
+        
+        # Analysis parameters
+        self.price_window = 100  # Number of price points for analysis
+        self.analysis_interval = 5  # Analysis interval in seconds
+        self.signal_threshold = 0.6  # Minimum signal strength
+        self.store_flush_interval = 1.0  # Seconds between batched Redis writes
+        
+        # Metrics
+        self.indicators_computed = Counter("indicators_computed_total", "Technical indicators computed", ["symbol", "indicator_type"])
+        self.signals_generated = Counter("signals_generated_total", "Trading signals generated", ["symbol", "signal_type"])
+        self.analysis_latency = Histogram("analysis_latency_seconds", "Analysis processing time", ["symbol"])
+        self.active_symbols = Gauge("active_analysis_symbols", "Number of symbols being analyzed")
+        
+        # Data storage
+        self.price_data: Dict[str, List[float]] = {}
+        self.indicators: Dict[str, Dict[str, float]] = {}
+        self.signal_retention = 3600  # Seconds to keep recent signals
+        self.max_signals_per_symbol = 1024
+        self.signals: Dict[str, deque] = defaultdict(lambda: deque(maxlen=self.max_signals_per_symbol))
         
+        # Tick-driven scheduling: symbols with new ticks since their last analysis
+        self._dirty_symbols: set = set()
+        self._tick_event = asyncio.Event()
+        self._last_tick_at = 0.0
+        
+        # Analysis results waiting for the next batched Redis flush
+        self._pending_store: Dict[str, Tuple[Dict[str, float], List[TradingSignal], float]] = {}
+        
+        # Last computed indicators per symbol, keyed by the newest ticks they were computed from
+        self._ind_cache: Dict[str, Tuple[tuple, Dict[str, float]]] = {}
+        self._ind_cache_size = 256
+        
+        # Indicator math is CPU-bound; run it off the event loop in worker processes
+        self._pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        
+    async def initialize(self):
+        """Initialize the analysis engine"""
         try:
-            current_price = indicators.get("price", 0)
-            if current_price == 0:
-                return signals
-            
-            # RSI signals
-            rsi = indicators.get("rsi_14", 50)
-            if rsi < 30:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="rsi_oversold",
-                    strength=min(1.0, (30 - rsi) / 30),
-                    direction="buy",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"rsi": rsi},
-                    description=f"RSI oversold at {rsi:.2f}"
-                ))
-            elif rsi > 70:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="rsi_overbought",
-                    strength=min(1.0, (rsi - 70) / 30),
-                    direction="sell",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"rsi": rsi},
-                    description=f"RSI overbought at {rsi:.2f}"
-                ))
+            await self.redis.ping()
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count())
+            logger.info("Real-time analysis engine initialized")
+        except Exception as e:
+            logger.error("Failed to initialize analysis engine", error=str(e))
+            raise
+    
+    async def get_price_data(self, symbol: str, window: int = None) -> List[float]:
+        """Get recent price data for a symbol"""
+        return [price for _, price in await self.get_price_ticks(symbol, window)]
+    
+    async def get_price_ticks(self, symbol: str, window: int = None) -> List[Tuple[float, float]]:
+        """Get recent (timestamp, price) ticks for a symbol, oldest first"""
+        ticks, _ = await self._read_price_ticks(symbol, window)
+        return ticks
+    
+    async def _read_price_ticks(self, symbol: str, window: int = None) -> Tuple[List[Tuple[float, float]], tuple]:
+        """Recent ticks for a symbol, plus a marker of the newest data per exchange.
+
+        Timestamps are whole seconds, so the marker pairs each exchange's
+        newest raw item with the number of ticks sharing its timestamp; it
+        changes with every tick pushed, including several in the same second.
+        """
+        try:
+            if window is None:
+                window = self.price_window
             
-            # MACD signals
-            macd = indicators.get("macd", 0)
-            signal_line = indicators.get("signal", 0)
-            histogram = indicators.get("histogram", 0)
+            # Get data from all exchanges
+            exchanges = ["binance", "bybit", "kucoin", "coinbase", "kraken", "okx", "gateio", "huobi"]
+            all_prices = []
+            head = []
             
-            if macd > signal_line and histogram > 0:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="macd_bullish",
-                    strength=min(1.0, abs(histogram) / current_price * 1000),
-                    direction="buy",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"macd": macd, "signal": signal_line, "histogram": histogram},
-                    description="MACD bullish crossover"
-                ))
-            elif macd < signal_line and histogram < 0:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="macd_bearish",
-                    strength=min(1.0, abs(histogram) / current_price * 1000),
-                    direction="sell",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"macd": macd, "signal": signal_line, "histogram": histogram},
-                    description="MACD bearish crossover"
-                ))
+            for exchange in exchanges:
+                key = f"rt:prices:{symbol}:{exchange}"
+                data = await self.redis.lrange(key, 0, window - 1)
+                
+                # Lists are pushed newest first
+                ticks = []
+                newest_ts = None
+                same_second = 0
+                for item in data:
+                    try:
+                        # Ingestion writes either "{epoch_sec},{price}" or a JSON object
+                        if item[:1] == "{":
+                            price_data = orjson.loads(item)
+                            tick = (price_data['timestamp'], price_data['price'])
+                        else:
+                            ts, price = item.split(",", 1)
+                            tick = (int(ts), float(price))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    ticks.append(tick)
+                    if newest_ts is None:
+                        newest_ts = tick[0]
+                    if tick[0] == newest_ts:
+                        same_second += 1
+                
+                # Oldest first, so the stable sort keeps same-second ticks in arrival order
+                all_prices.extend(reversed(ticks))
+                head.append((data[0], same_second) if data else None)
             
-            # Bollinger Bands signals
-            upper_bb = indicators.get("upper", 0)
-            lower_bb = indicators.get("lower", 0)
-            middle_bb = indicators.get("middle", 0)
+            # Sort by timestamp
+            all_prices.sort(key=lambda x: x[0])
+            return all_prices[-window:], tuple(head)
             
-            if current_price < lower_bb:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="bb_oversold",
-                    strength=min(1.0, (lower_bb - current_price) / (upper_bb - lower_bb)),
-                    direction="buy",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"upper_bb": upper_bb, "lower_bb": lower_bb, "middle_bb": middle_bb},
-                    description="Price below lower Bollinger Band"
-                ))
-            elif current_price > upper_bb:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="bb_overbought",
-                    strength=min(1.0, (current_price - upper_bb) / (upper_bb - lower_bb)),
-                    direction="sell",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"upper_bb": upper_bb, "lower_bb": lower_bb, "middle_bb": middle_bb},
-                    description="Price above upper Bollinger Band"
-                ))
+        except Exception as e:
+            logger.error(f"Failed to get price data for {symbol}", error=str(e))
+            return [], ()
+    
+    def generate_trading_signals(self, symbol: str, indicators: Dict[str, float]) -> List[TradingSignal]:
+        """Generate trading signals based on technical indicators"""
+        return self.generate_trading_signals_batch([symbol], [indicators]).get(symbol, [])
+    
+    def generate_trading_signals_batch(
+        self,
+        symbols: List[str],
+        indicator_rows: List[Dict[str, float]],
+        min_strength: float = 0.0,
+        timestamp: Optional[float] = None,
+    ) -> Dict[str, List[TradingSignal]]:
+        """Generate trading signals for many symbols at once.
+
+        Indicators are laid out column-wise so every rule in SIGNAL_RULES is a
+        single vectorized comparison; TradingSignal objects are only built for
+        matches whose strength reaches min_strength.
+        """
+        result: Dict[str, List[TradingSignal]] = {symbol: [] for symbol in symbols}
+        if not symbols:
+            return result
+        
+        try:
+            if timestamp is None:
+                timestamp = time.time()
+            
+            matrix = np.array(
+                [[row.get(col, default) for col, default in SIGNAL_COLUMNS.items()] for row in indicator_rows],
+                dtype=np.float64,
+            )
+            columns = {col: matrix[:, i] for i, col in enumerate(SIGNAL_COLUMNS)}
+            has_price = columns["price"] != 0
+            
+            with np.errstate(divide="ignore", invalid="ignore"):
+                for signal_type, direction, mask_fn, strength_fn, fields, describe in SIGNAL_RULES:
+                    mask = has_price & mask_fn(columns)
+                    if not mask.any():
+                        continue
+                    strengths = np.minimum(1.0, strength_fn(columns))
+                    for idx in np.nonzero(mask & (strengths >= min_strength))[0]:
+                        values = {name: float(columns[col][idx]) for name, col in fields.items()}
+                        result[symbols[idx]].append(TradingSignal(
+                            symbol=symbols[idx],
+                            signal_type=signal_type,
+                            strength=float(strengths[idx]),
+                            direction=direction,
+                            price=float(columns["price"][idx]),
+                            timestamp=timestamp,
+                            indicators=values,
+                            description=describe(values)
+                        ))
             
-            # Moving Average signals
-            sma_20 = indicators.get("sma_20", 0)
-            sma_50 = indicators.get("sma_50", 0)
+        except Exception as e:
+            logger.error("Failed to generate signals", symbols=len(symbols), error=str(e))
+        
+        return result
+    
+    async def compute_symbol_indicators(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Fetch recent prices for a symbol and compute its indicators"""
+        try:
+            # Get price data
+            ticks, head = await self._read_price_ticks(symbol)
+            if len(ticks) < 20:
+                return None
             
-            if sma_20 > sma_50 and current_price > sma_20:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="ma_bullish",
-                    strength=min(1.0, (sma_20 - sma_50) / sma_50),
-                    direction="buy",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"sma_20": sma_20, "sma_50": sma_50},
-                    description="Price above rising moving averages"
-                ))
-            elif sma_20 < sma_50 and current_price < sma_20:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="ma_bearish",
-                    strength=min(1.0, (sma_50 - sma_20) / sma_50),
-                    direction="sell",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"sma_20": sma_20, "sma_50": sma_50},
-                    description="Price below falling moving averages"
-                ))
+            # Skip recomputation when no new ticks arrived since the last cycle
+            cached = self._ind_cache.get(symbol)
+            if cached and cached[0] == head:
+                return cached[1]
+            prices = [price for _, price in ticks]
             
-            # Stochastic signals
-            stoch_k = indicators.get("k", 50)
-            stoch_d = indicators.get("d", 50)
+            # Calculate indicators
+            if self._pool is not None:
+                loop = asyncio.get_running_loop()
+                indicators = await loop.run_in_executor(
+                    self._pool, _compute_indicators_worker, symbol, np.asarray(prices, dtype=np.float64)
+                )
+            else:
+                indicators = self.calculate_indicators(symbol, prices)
+            if not indicators:
+                return None
             
-            if stoch_k < 20 and stoch_d < 20:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="stoch_oversold",
-                    strength=min(1.0, (20 - stoch_k) / 20),
-                    direction="buy",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"stoch_k": stoch_k, "stoch_d": stoch_d},
-                    description="Stochastic oversold"
-                ))
-            elif stoch_k > 80 and stoch_d > 80:
-                signals.append(TradingSignal(
-                    symbol=symbol,
-                    signal_type="stoch_overbought",
-                    strength=min(1.0, (stoch_k - 80) / 20),
-                    direction="sell",
-                    price=current_price,
-                    timestamp=time.time(),
-                    indicators={"stoch_k": stoch_k, "stoch_d": stoch_d},
-                    description="Stochastic overbought"
-                ))
+            self._ind_cache.pop(symbol, None)
+            if len(self._ind_cache) >= self._ind_cache_size:
+                self._ind_cache.pop(next(iter(self._ind_cache)))
+            self._ind_cache[symbol] = (head, indicators)
+            return indicators
             
         except Exception as e:
-            logger.error(f"Failed to generate signals for {symbol}", error=str(e))
-        
-        return signals
+            logger.error(f"Failed to compute indicators for {symbol}", error=str(e))
+            return None
     
     async def analyze_symbol(self, symbol: str):
         """Analyze a single symbol"""
+        await self.analyze_symbols([symbol])
+    
+    async def analyze_symbols(self, symbols: List[str], store: bool = True):
+        """Analyze a batch of symbols, generating signals for all of them in one pass
+
+        Results are queued for Redis; with store=False they are left for the
+        periodic flush instead of being written immediately.
+        """
         try:
             start_time = time.time()
             
-            # Get price data
-            prices = await self.get_price_data(symbol)
-            if len(prices) < 20:
-                return
-            
-            # Calculate indicators
-            indicators = self.calculate_indicators(symbol, prices)
-            if not indicators:
+            results = await asyncio.gather(*(self.compute_symbol_indicators(symbol) for symbol in symbols))
+            ready = [(symbol, indicators) for symbol, indicators in zip(symbols, results) if indicators]
+            if not ready:
                 return
             
-            # Store indicators
-            self.indicators[symbol] = indicators
-            
             # Generate signals
-            signals = self.generate_trading_signals(symbol, indicators)
-            
-            # Store signals
-            if symbol not in self.signals:
-                self.signals[symbol] = []
-            
-            # Keep only recent signals
-            self.signals[symbol] = [s for s in self.signals[symbol] if time.time() - s.timestamp < 3600]  # 1 hour
-            
-            # Add new signals
-            for signal in signals:
-                if signal.strength >= self.signal_threshold:
-                    self.signals[symbol].append(signal)
+            now = time.time()
+            ready_symbols = [symbol for symbol, _ in ready]
+            signals_by_symbol = self.generate_trading_signals_batch(
+                ready_symbols,
+                [indicators for _, indicators in ready],
+                min_strength=self.signal_threshold,
+                timestamp=now,
+            )
+            
+            for symbol, indicators in ready:
+                signals = signals_by_symbol[symbol]
+                
+                # Store indicators
+                self.indicators[symbol] = indicators
+                
+                # Keep only recent signals (oldest are at the left)
+                recent = self.signals[symbol]
+                while recent and now - recent[0].timestamp >= self.signal_retention:
+                    recent.popleft()
+                
+                # Add new signals
+                recent.extend(signals)
+                
+                self._pending_store[symbol] = (indicators, signals, now)
             
-            # Store in Redis
-            await self.store_analysis_data(symbol, indicators, signals)
+            if store:
+                await self.flush_analysis_data()
             
             # Update metrics
-            for indicator_type in indicators.keys():
-                self.indicators_computed.labels(symbol=symbol, indicator_type=indicator_type).inc()
-            
-            for signal in signals:
-                if signal.strength >= self.signal_threshold:
+            elapsed = time.time() - start_time
+            for symbol, indicators in ready:
+                for indicator_type in indicators.keys():
+                    self.indicators_computed.labels(symbol=symbol, indicator_type=indicator_type).inc()
+                
+                for signal in signals_by_symbol[symbol]:
                     self.signals_generated.labels(symbol=symbol, signal_type=signal.signal_type).inc()
+                
+                self.analysis_latency.labels(symbol=symbol).observe(elapsed)
             
-            self.analysis_latency.labels(symbol=symbol).observe(time.time() - start_time)
-            
         except Exception as e:
-            logger.error(f"Failed to analyze {symbol}", error=str(e))
+            logger.error("Failed to analyze symbols", symbols=len(symbols), error=str(e))
+    
+    def _queue_analysis_data(self, pipe, symbol: str, indicators: Dict[str, float], signals: List[TradingSignal], timestamp: float):
+        """Queue the indicator, signal and aggregated analysis writes for a symbol on a pipeline"""
+        signals_data = [signal.to_dict() for signal in signals if signal.strength >= self.signal_threshold]
+        analysis_data = {
+            "symbol": symbol,
+            "indicators": indicators,
+            "signals": signals_data,
+            "timestamp": timestamp,
+            "signal_count": len(signals_data)
+        }
+        pipe.setex(f"indicators:{symbol}", 300, orjson.dumps(indicators))
+        pipe.setex(f"signals:{symbol}", 300, orjson.dumps(signals_data))
+        pipe.setex(f"analysis:{symbol}", 300, orjson.dumps(analysis_data))
+    
+    async def flush_analysis_data(self):
+        """Write all pending analysis results to Redis in one round-trip"""
+        if not self._pending_store:
+            return
+        pending, self._pending_store = self._pending_store, {}
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for symbol, (indicators, signals, timestamp) in pending.items():
+                    self._queue_analysis_data(pipe, symbol, indicators, signals, timestamp)
+                await pipe.execute()
+        except Exception as e:
+            logger.error("Failed to store analysis data", symbols=len(pending), error=str(e))
     
     async def store_analysis_data(self, symbol: str, indicators: Dict[str, float], signals: List[TradingSignal]):
         """Store analysis data in Redis"""
         try:
-            # Store indicators
-            indicators_key = f"indicators:{symbol}"
-            await self.redis.setex(indicators_key, 300, json.dumps(indicators))
-            
-            # Store signals
-            signals_key = f"signals:{symbol}"
-            signals_data = [asdict(signal) for signal in signals if signal.strength >= self.signal_threshold]
-            await self.redis.setex(signals_key, 300, json.dumps(signals_data))
-            
-            # Store aggregated analysis
-            analysis_data = {
-                "symbol": symbol,
-                "indicators": indicators,
-                "signals": signals_data,
-                "timestamp": time.time(),
-                "signal_count": len(signals_data)
-            }
-            
-            analysis_key = f"analysis:{symbol}"
-            await self.redis.setex(analysis_key, 300, json.dumps(analysis_data))
+            async with self.redis.pipeline(transaction=False) as pipe:
+                self._queue_analysis_data(pipe, symbol, indicators, signals, time.time())
+                await pipe.execute()
             
         except Exception as e:
             logger.error(f"Failed to store analysis data for {symbol}", error=str(e))
@@ -504,7 +729,7 @@ class RealTimeAnalysisEngine:
             for key in keys:
                 data = await self.redis.get(key)
                 if data:
-                    symbol_data = json.loads(data)
+                    symbol_data = orjson.loads(data)
                     symbols.append(symbol_data["symbol"])
             
             return symbols[:50]  # Limit to top 50 symbols
@@ -513,31 +738,72 @@ class RealTimeAnalysisEngine:
             logger.error("Failed to get active symbols", error=str(e))
             return []
     
+    async def _listen_for_ticks(self):
+        """Mark symbols dirty as tick notifications arrive from ingestion"""
+        pubsub = self.redis.pubsub()
+        try:
+            await pubsub.psubscribe(f"{TICK_CHANNEL_PREFIX}*")
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                self._dirty_symbols.add(message["channel"][len(TICK_CHANNEL_PREFIX):])
+                self._last_tick_at = time.time()
+                self._tick_event.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Tick subscription failed, falling back to polling", error=str(e))
+        finally:
+            await pubsub.reset()
+    
+    async def _flush_loop(self):
+        """Periodically write queued analysis results to Redis"""
+        while True:
+            await asyncio.sleep(self.store_flush_interval)
+            await self.flush_analysis_data()
+    
     async def run(self):
-        """Main analysis loop"""
+        """Main analysis loop
+
+        Symbols are analyzed as soon as ingestion publishes a tick for them.
+        When no ticks have been seen for a full analysis interval (e.g. the
+        publishers are not running) it falls back to polling every active
+        symbol each interval.
+        """
+        background: List[asyncio.Task] = []
         try:
             logger.info("Starting Real-Time Analysis Engine")
             
             # Initialize
             await self.initialize()
+            background.append(asyncio.create_task(self._listen_for_ticks()))
+            background.append(asyncio.create_task(self._flush_loop()))
+            
+            active: set = set()
+            active_refreshed_at = 0.0
             
             while True:
-                start_time = time.time()
-                
-                # Get active symbols
-                symbols = await self.get_active_symbols()
-                self.active_symbols.set(len(symbols))
+                try:
+                    await asyncio.wait_for(self._tick_event.wait(), timeout=self.analysis_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._tick_event.clear()
+                now = time.time()
                 
-                if symbols:
-                    # Analyze all symbols in parallel
-                    tasks = [self.analyze_symbol(symbol) for symbol in symbols]
-                    await asyncio.gather(*tasks, return_exceptions=True)
+                # Refresh the set of active symbols once per interval
+                polling = now - self._last_tick_at >= self.analysis_interval
+                if now - active_refreshed_at >= self.analysis_interval:
+                    symbols = await self.get_active_symbols()
+                    active = set(symbols)
+                    active_refreshed_at = now
+                    self.active_symbols.set(len(symbols))
+                    if polling:
+                        self._dirty_symbols.update(symbols)
                 
-                # Wait for next analysis cycle
-                elapsed = time.time() - start_time
-                sleep_time = max(0, self.analysis_interval - elapsed)
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
+                batch = [symbol for symbol in self._dirty_symbols if symbol in active]
+                self._dirty_symbols.clear()
+                if batch:
+                    await self.analyze_symbols(batch, store=False)
                 
         except KeyboardInterrupt:
             logger.info("Analysis engine stopped by user")
@@ -545,6 +811,13 @@ class RealTimeAnalysisEngine:
             logger.error("Analysis engine failed", error=str(e))
             raise
         finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            await self.flush_analysis_data()
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
             if self.redis:
                 await self.redis.close()
             logger.info("Analysis engine cleanup completed")
@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import hashlib
 import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import List, Optional, Tuple
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
@@ -18,6 +20,12 @@ from models.user import User
 
 logger = structlog.get_logger()
 
+# Recently rejected token hashes -> (expires_at, error message). Lets repeated
+# hits on dead links (crawlers, link previews) skip the row lock entirely.
+_NEGATIVE_CACHE_TTL = 60.0
+_NEGATIVE_CACHE_SIZE = 10_000
+_negative_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
 
 class RemoteAccessError(Exception):
     """Base remote access exception"""
@@ -62,7 +70,6 @@ class RemoteAccessService:
 
         self.db.add(link)
         await self.db.commit()
-        await self.db.refresh(link)
 
         logger.info(
             "remote_access.link_created",
@@ -105,28 +112,42 @@ class RemoteAccessService:
     async def consume_token(self, token: str, request_ip: Optional[str] = None) -> RemoteAccessLink:
         """Validate and consume a remote access token."""
         token_hash = self._hash_token(token)
+        now = time.monotonic()
+        cached = _negative_cache.get(token_hash)
+        if cached:
+            if cached[0] > now:
+                raise RemoteAccessError(cached[1])
+            _negative_cache.pop(token_hash, None)
+
+        hash_candidates = (token_hash, self._legacy_hash_token(token))
+        used_at = datetime.utcnow()
+        values = {
+            "uses_left": RemoteAccessLink.uses_left - 1,
+            "last_used_at": used_at,
+            # Move links created before the BLAKE2b switch onto the new hash
+            "token_hash": token_hash,
+        }
+        if request_ip:
+            values["last_used_ip"] = request_ip
+
+        # Validate and consume in a single round-trip
         result = await self.db.execute(
-            select(RemoteAccessLink)
-            .where(RemoteAccessLink.token_hash == token_hash)
-            .with_for_update()
+            update(RemoteAccessLink)
+            .where(
+                RemoteAccessLink.token_hash.in_(hash_candidates),
+                RemoteAccessLink.uses_left > 0,
+                or_(RemoteAccessLink.expires_at.is_(None), RemoteAccessLink.expires_at >= used_at),
+            )
+            .values(**values)
+            .returning(RemoteAccessLink)
+            .execution_options(synchronize_session=False)
         )
         link = result.scalar_one_or_none()
         if not link:
-            raise RemoteAccessError("Invalid or expired access token")
-
-        if link.expires_at and link.expires_at < datetime.utcnow():
-            raise RemoteAccessError("This link has expired")
-
-        if link.uses_left <= 0:
-            raise RemoteAccessError("This link has no remaining uses")
-
-        link.uses_left -= 1
-        link.last_used_at = datetime.utcnow()
-        if request_ip:
-            link.last_used_ip = request_ip
+            await self.db.rollback()
+            await self._reject_unusable(hash_candidates, token_hash, now, used_at)
 
         await self.db.commit()
-        await self.db.refresh(link)
 
         logger.info(
             "remote_access.link_consumed",
@@ -147,6 +168,40 @@ class RemoteAccessService:
         )
         return f"{base_url.rstrip('/')}/remote/{token}"
 
+    async def _reject_unusable(
+        self,
+        hash_candidates: Tuple[str, str],
+        token_hash: str,
+        now: float,
+        used_at: datetime,
+    ) -> None:
+        """Work out why a token could not be consumed and reject it."""
+        result = await self.db.execute(
+            select(RemoteAccessLink.expires_at, RemoteAccessLink.uses_left)
+            .where(RemoteAccessLink.token_hash.in_(hash_candidates))
+        )
+        row = result.first()
+        if not row:
+            self._reject(token_hash, now, "Invalid or expired access token")
+        if row.expires_at and row.expires_at < used_at:
+            self._reject(token_hash, now, "This link has expired")
+        self._reject(token_hash, now, "This link has no remaining uses")
+
+    @staticmethod
+    def _reject(token_hash: str, now: float, message: str) -> None:
+        """Remember a rejected token for a short while, then raise."""
+        _negative_cache[token_hash] = (now + _NEGATIVE_CACHE_TTL, message)
+        _negative_cache.move_to_end(token_hash)
+        while len(_negative_cache) > _NEGATIVE_CACHE_SIZE:
+            _negative_cache.popitem(last=False)
+        raise RemoteAccessError(message)
+
     @staticmethod
     def _hash_token(token: str) -> str:
+        # Tokens are 256-bit random values, so a fast lookup hash is sufficient
+        return hashlib.blake2b(token.encode("utf-8"), digest_size=32).hexdigest()
+
+    @staticmethod
+    def _legacy_hash_token(token: str) -> str:
+        """SHA-256 hash used for links created before the BLAKE2b switch."""
         return hashlib.sha256(token.encode("utf-8")).hexdigest()
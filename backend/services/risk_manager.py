@@ -3,32 +3,260 @@ Advanced Risk Management System
 """
 
 import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import structlog
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import and_, bindparam, desc, func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_async_session
-from models.trading import Order, Position, RiskMetrics, Strategy
+from core.database import engine, get_async_session
+from models.market_data import Kline
+from models.trading import Order, OrderStatus, Position, RiskMetrics, Strategy
 
 logger = structlog.get_logger()
 
+# Statements are built once at import; per-call values are bound parameters
+_STMT_OTHER_POSITION_SYMBOLS = (
+    select(Position.symbol)
+    .distinct()
+    .where(
+        and_(
+            Position.is_active.is_(True),
+            Position.symbol != bindparam('symbol')
+        )
+    )
+)
+
+_STMT_RECENT_CLOSES = (
+    select(Kline.symbol, Kline.open_time, Kline.close_price)
+    .where(
+        and_(
+            Kline.symbol.in_(bindparam('symbols', expanding=True)),
+            Kline.exchange == bindparam('exchange'),
+            Kline.interval == bindparam('interval'),
+            Kline.open_time >= bindparam('cutoff')
+        )
+    )
+    .order_by(Kline.open_time)
+)
+
+# The predicate matches ix_positions_updated_at_pnl; rows with both PnL
+# columns NULL contribute nothing to the sum anyway
+_STMT_DAILY_PNL = (
+    select(func.coalesce(func.sum(Position.realized_pnl + Position.unrealized_pnl), 0))
+    .where(
+        and_(
+            Position.updated_at >= bindparam('start_of_day'),
+            or_(
+                Position.realized_pnl.isnot(None),
+                Position.unrealized_pnl.isnot(None)
+            )
+        )
+    )
+)
+
+# Latest risk metrics plus position and open order counts in one round-trip
+_LATEST_RISK_METRICS = (
+    select(RiskMetrics)
+    .order_by(desc(RiskMetrics.calculated_at))
+    .limit(1)
+    .subquery()
+)
+_STMT_RISK_SUMMARY = select(
+    _LATEST_RISK_METRICS,
+    select(func.count(Position.id))
+    .where(Position.is_active.is_(True))
+    .scalar_subquery()
+    .label('pc'),
+    select(func.count(Order.id))
+    .where(Order.status == 'pending')
+    .scalar_subquery()
+    .label('oc'),
+)
+
+# Emergency stop, run as Core statements against the tables
+_orders = Order.__table__
+_positions = Position.__table__
+_STMT_CANCEL_PENDING_ORDERS = (
+    update(_orders)
+    .where(_orders.c.status == OrderStatus.PENDING)
+    .values(status=OrderStatus.CANCELLED)
+)
+_STMT_CLOSE_ACTIVE_POSITIONS = (
+    update(_positions)
+    .where(_positions.c.is_active.is_(True))
+    .values(is_active=False, closed_at=bindparam('closed_at'))
+)
+
+# Only the columns the heatmap needs, fetched in chunks
+HEATMAP_CHUNK_SIZE = 1000
+_STMT_HEATMAP_POSITIONS = (
+    select(
+        Position.symbol,
+        Position.quantity,
+        Position.current_price,
+        Position.entry_price,
+        Position.unrealized_pnl
+    )
+    .where(Position.is_active.is_(True))
+    .execution_options(yield_per=HEATMAP_CHUNK_SIZE)
+)
+
+MIN_CORRELATION_SAMPLES = 10
+PORTFOLIO_VALUE_TTL = 1.0        # seconds
+DAILY_LIMIT_TTL = 5.0            # seconds
+CORRELATION_CACHE_TTL = 300.0    # seconds
+CORRELATION_CACHE_SIZE = 1024
+
+# Shared pool for NumPy work that would otherwise stall the event loop
+_CPU_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="risk-cpu")
+
+
+def _session_scope(session: Optional[AsyncSession]):
+    """Use the caller's session as-is, or open (and close) a new one"""
+    return nullcontext(session) if session is not None else get_async_session()
+
+
+def _heatmap_chunk(positions, portfolio_value: float) -> Dict[str, Dict]:
+    """Heatmap entries for a chunk of (symbol, quantity, current, entry, upnl) rows"""
+    # Column-wise arrays so the risk math runs as a few vector ops
+    n = len(positions)
+    quantity = np.fromiter((float(p.quantity) for p in positions), dtype=float, count=n)
+    current_price = np.fromiter((float(p.current_price) for p in positions), dtype=float, count=n)
+    entry_price = np.fromiter((float(p.entry_price) for p in positions), dtype=float, count=n)
+    unrealized_pnl = np.fromiter((float(p.unrealized_pnl) for p in positions), dtype=float, count=n)
+    
+    position_value = quantity * current_price
+    weight = position_value / portfolio_value
+    
+    # Calculate VaR (simplified)
+    volatility = 0.02  # 2% daily volatility
+    var_95 = position_value * (volatility * 1.645)  # 95% VaR
+    pnl_percentage = (current_price - entry_price) / entry_price * 100
+    
+    return {
+        position.symbol: {
+            "weight": w,
+            "value": v,
+            "var_95": var,
+            "unrealized_pnl": pnl,
+            "pnl_percentage": pct
+        }
+        for position, w, v, var, pnl, pct in zip(
+            positions,
+            weight.tolist(),
+            position_value.tolist(),
+            var_95.tolist(),
+            unrealized_pnl.tolist(),
+            pnl_percentage.tolist()
+        )
+    }
+
+
+def _kelly(win_rate: float, avg_win: float, avg_loss: float) -> float:
+    """Simplified Kelly fraction, capped at 25%; 1.0 (no scaling) without a loss history"""
+    if avg_loss <= 0:
+        return 1.0
+    if avg_win <= 0:
+        return 0.0
+    kelly_fraction = (win_rate * avg_win - (1 - win_rate) * avg_loss) / avg_win
+    return max(0.0, min(kelly_fraction, 0.25))
+
+
+def _pair_key(symbol1: str, symbol2: str) -> Tuple[str, str]:
+    """Order-independent cache key for a symbol pair"""
+    return (symbol1, symbol2) if symbol1 <= symbol2 else (symbol2, symbol1)
+
+
+def _log_returns_matrix(symbols: List[str], rows) -> tuple:
+    """Pivot (symbol, open_time, close) rows into an (N, T-1) log-returns matrix.
+
+    Symbols without enough history are dropped and only timestamps present for
+    every remaining symbol are kept. Returns the surviving symbols (in input
+    order) and the matrix, or None when there is not enough shared history.
+    """
+    index = {sym: i for i, sym in enumerate(symbols)}
+    times = sorted({row[1] for row in rows})
+    column = {ts: j for j, ts in enumerate(times)}
+    
+    prices = np.full((len(symbols), len(times)), np.nan)
+    for sym, ts, close in rows:
+        prices[index[sym], column[ts]] = close
+        
+    has_history = np.count_nonzero(~np.isnan(prices), axis=1) >= MIN_CORRELATION_SAMPLES
+    prices = prices[has_history]
+    prices = prices[:, ~np.isnan(prices).any(axis=0)]
+    kept = [sym for sym, keep in zip(symbols, has_history) if keep]
+    
+    if prices.shape[1] < MIN_CORRELATION_SAMPLES or np.any(prices <= 0):
+        return kept, None
+    return kept, np.diff(np.log(prices), axis=1)
+
+
+def _correlate_with_first(symbols: List[str], rows) -> Dict[str, float]:
+    """Correlation of symbols[0]'s returns with each of the other symbols.
+
+    Pairs without enough shared history map to NaN, which never exceeds a
+    correlation limit.
+    """
+    correlations = dict.fromkeys(symbols[1:], float('nan'))
+    kept, returns = _log_returns_matrix(symbols, rows)
+    if returns is not None and kept[0] == symbols[0] and len(kept) > 1:
+        # Only the first row of the correlation matrix is needed, so
+        # standardize once and take one matrix-vector product: O(N*T)
+        # instead of corrcoef's O(N^2*T)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = returns - returns.mean(axis=1, keepdims=True)
+            z /= returns.std(axis=1, ddof=1, keepdims=True)
+            row = (z[1:] @ z[0]) / (returns.shape[1] - 1)
+        correlations.update(zip(kept[1:], row.tolist()))
+    return correlations
+
 
 class RiskManager:
     """Advanced risk management system with position sizing and limits"""
     
     def __init__(self):
-        self.max_portfolio_risk = Decimal('0.02')  # 2% max portfolio risk per trade
-        self.max_daily_loss = Decimal('0.05')      # 5% max daily loss
-        self.max_correlation = Decimal('0.7')      # Max correlation between positions
-        self.max_leverage = Decimal('10.0')        # Max leverage
-        self.min_confidence = Decimal('0.6')       # Min signal confidence
+        # Risk gating is approximate, so limits are plain floats; Decimal is
+        # only used for quantities written back to the database
+        self.max_portfolio_risk = 0.02             # 2% max portfolio risk per trade
+        self.max_daily_loss = 0.05                 # 5% max daily loss
+        self.max_correlation = 0.7                 # Max correlation between positions
+        self.max_leverage = 10.0                   # Max leverage
+        self.min_confidence = 0.6                  # Min signal confidence
+        self.check_timeout = 2.0                   # Seconds allowed for the I/O-bound checks
+        self.correlation_interval = '1h'           # Kline interval used for correlation
+        self.correlation_exchange = 'binance'      # Single kline source, so exchanges never interleave
+        self.correlation_lookback = timedelta(days=7)
         
-    async def check_order_risk(self, signal: Dict, strategy: Strategy) -> bool:
-        """Check if order passes risk management rules"""
+        # Short-lived caches for values reused across signals
+        self._pv_cache: Optional[Tuple[float, float]] = None
+        self._daily_limit_cache: Optional[Tuple[float, bool]] = None
+        self._corr_cache: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()
+        self._corr_hits = 0
+        self._corr_misses = 0
+        # strategy id -> (stats snapshot, (max_position_size, kelly_fraction))
+        self._sizing_cache: Dict[int, Tuple[tuple, Tuple[float, float]]] = {}
+        
+    async def check_order_risk(
+        self, signal: Dict, strategy: Strategy, session: Optional[AsyncSession] = None
+    ) -> bool:
+        """Check if order passes risk management rules.
+
+        Pass ``session`` to run the database checks on the caller's session
+        instead of opening a new one.
+        """
+        # Checks run cheapest first and return on the first rejection:
+        # in-memory checks, then the daily loss aggregate (cached for a few
+        # seconds), then correlation, which may need a klines query
         try:
             # Check signal confidence
             confidence = signal.get('confidence', 0)
@@ -36,144 +264,183 @@ class RiskManager:
                 logger.warning(f"Signal confidence too low: {confidence}")
                 return False
                 
-            # Check position size
-            if not await self._check_position_size(signal, strategy):
-                return False
-                
-            # Check correlation limits
-            if not await self._check_correlation_limits(signal):
+            # Check leverage limits
+            if not self._check_leverage_limits(signal):
                 return False
                 
-            # Check daily loss limits
-            if not await self._check_daily_limits():
+            portfolio_value = await self._get_portfolio_value()
+            
+            # Check position size
+            if not self._check_position_size(signal, strategy, portfolio_value):
                 return False
                 
-            # Check leverage limits
-            if not await self._check_leverage_limits(signal):
-                return False
+            # Database-backed checks share one session under a single deadline
+            async with _session_scope(session) as s:
+                return await asyncio.wait_for(
+                    self._check_db_limits(signal, portfolio_value, s),
+                    timeout=self.check_timeout,
+                )
                 
-            return True
-            
+        except asyncio.TimeoutError:
+            logger.warning(f"Risk checks timed out after {self.check_timeout}s")
+            return False
+        except SQLAlchemyError as e:
+            logger.error(f"Database error checking order risk: {e}")
+            return False
+        except KeyError as e:
+            logger.error(f"Signal missing field for risk check: {e}")
+            return False
         except Exception as e:
+            # Fail closed on anything unexpected
             logger.error(f"Error checking order risk: {e}")
             return False
             
-    async def _check_position_size(self, signal: Dict, strategy: Strategy) -> bool:
+    def _check_position_size(self, signal: Dict, strategy: Strategy, portfolio_value: float) -> bool:
         """Check if position size is within limits"""
-        try:
-            # Get current portfolio value
-            portfolio_value = await self._get_portfolio_value()
-            
-            # Calculate proposed position size
-            position_size = signal.get('quantity', 0)
-            position_value = position_size * signal.get('price', 1)
-            
-            # Check against max position size
-            max_position_value = portfolio_value * strategy.max_position_size
-            if position_value > max_position_value:
-                logger.warning(f"Position size exceeds limit: {position_value} > {max_position_value}")
-                return False
-                
-            # Check against portfolio risk
-            max_risk_value = portfolio_value * self.max_portfolio_risk
-            if position_value > max_risk_value:
-                logger.warning(f"Position exceeds portfolio risk limit: {position_value} > {max_risk_value}")
-                return False
-                
-            return True
+        # Calculate proposed position size
+        position_size = signal.get('quantity', 0)
+        position_value = position_size * signal.get('price', 1)
+        
+        # Check against max position size
+        max_position_value = portfolio_value * float(strategy.max_position_size)
+        if position_value > max_position_value:
+            logger.warning(f"Position size exceeds limit: {position_value} > {max_position_value}")
+            return False
             
-        except Exception as e:
-            logger.error(f"Error checking position size: {e}")
+        # Check against portfolio risk
+        max_risk_value = portfolio_value * self.max_portfolio_risk
+        if position_value > max_risk_value:
+            logger.warning(f"Position exceeds portfolio risk limit: {position_value} > {max_risk_value}")
             return False
             
-    async def _check_correlation_limits(self, signal: Dict) -> bool:
+        return True
+        
+    async def _check_db_limits(self, signal: Dict, portfolio_value: float, session: AsyncSession) -> bool:
+        """Run the database-backed checks on one session.
+
+        An AsyncSession cannot execute statements concurrently, so these run
+        one after the other and stop at the first rejection.
+        """
+        return (
+            await self._check_daily_limits(portfolio_value, session)
+            and await self._check_correlation_limits(signal, session)
+        )
+        
+    async def _check_correlation_limits(self, signal: Dict, session: Optional[AsyncSession] = None) -> bool:
         """Check correlation limits with existing positions"""
-        try:
-            symbol = signal['symbol']
+        symbol = signal['symbol']
+        
+        async with _session_scope(session) as session:
+            # Get symbols of existing positions
+            result = await session.execute(_STMT_OTHER_POSITION_SYMBOLS, {'symbol': symbol})
+            existing_symbols = result.scalars().all()
             
-            # Get existing positions
-            async with get_async_session() as session:
-                result = await session.execute(
-                    select(Position).where(
-                        and_(
-                            Position.is_active == True,
-                            Position.symbol != symbol
-                        )
-                    )
-                )
-                existing_positions = result.scalars().all()
+            if not existing_symbols:
+                return True
                 
-                if not existing_positions:
-                    return True
-                    
-                # Calculate correlation (simplified - would use actual correlation data)
-                for position in existing_positions:
-                    correlation = await self._calculate_correlation(symbol, position.symbol)
-                    if correlation > self.max_correlation:
-                        logger.warning(f"Correlation too high: {symbol} vs {position.symbol} = {correlation}")
-                        return False
-                        
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error checking correlation limits: {e}")
+            correlations = self._get_cached_correlations(symbol, existing_symbols)
+            if correlations is None:
+                correlations = await self._load_correlations(session, symbol, existing_symbols)
+                
+        others = list(correlations)
+        values = np.fromiter(correlations.values(), dtype=float, count=len(others))
+        too_high = values > self.max_correlation
+        if np.any(too_high):
+            idx = int(np.argmax(too_high))
+            logger.warning(f"Correlation too high: {symbol} vs {others[idx]} = {values[idx]:.2f}")
             return False
             
-    async def _check_daily_limits(self) -> bool:
+        return True
+        
+    def _get_cached_correlations(self, symbol: str, others: List[str]) -> Optional[Dict[str, float]]:
+        """Return cached correlations of symbol against others, or None on any miss"""
+        now = time.monotonic()
+        correlations = {}
+        for other in others:
+            entry = self._corr_cache.get(_pair_key(symbol, other))
+            if entry is None or entry[0] <= now:
+                self._corr_misses += 1
+                logger.debug("Correlation cache miss", symbol=symbol, hits=self._corr_hits, misses=self._corr_misses)
+                return None
+            correlations[other] = entry[1]
+        self._corr_hits += 1
+        return correlations
+        
+    async def _load_correlations(self, session: AsyncSession, symbol: str, others: List[str]) -> Dict[str, float]:
+        """Compute correlations of symbol against others from recent klines and cache them"""
+        # Fetch recent closes for every symbol in one query
+        symbols = [symbol, *others]
+        cutoff = datetime.utcnow() - self.correlation_lookback
+        result = await session.execute(
+            _STMT_RECENT_CLOSES,
+            {
+                'symbols': symbols,
+                'exchange': self.correlation_exchange,
+                'interval': self.correlation_interval,
+                'cutoff': cutoff
+            }
+        )
+        rows = result.all()
+        
+        # The pivot and corrcoef are CPU-bound; keep them off the event loop
+        correlations = await asyncio.get_running_loop().run_in_executor(
+            _CPU_POOL, _correlate_with_first, symbols, rows
+        )
+        
+        expires_at = time.monotonic() + CORRELATION_CACHE_TTL
+        for other, value in correlations.items():
+            key = _pair_key(symbol, other)
+            self._corr_cache[key] = (expires_at, value)
+            self._corr_cache.move_to_end(key)
+        while len(self._corr_cache) > CORRELATION_CACHE_SIZE:
+            self._corr_cache.popitem(last=False)
+            
+        return correlations
+        
+    async def _check_daily_limits(self, portfolio_value: float, session: Optional[AsyncSession] = None) -> bool:
         """Check daily loss limits"""
-        try:
-            # Get today's PnL
-            today = datetime.utcnow().date()
-            start_of_day = datetime.combine(today, datetime.min.time())
+        # Signals arriving in bursts reuse the last verdict for a few seconds
+        now = time.monotonic()
+        if self._daily_limit_cache is not None and self._daily_limit_cache[0] > now:
+            return self._daily_limit_cache[1]
             
-            async with get_async_session() as session:
-                result = await session.execute(
-                    select(func.sum(Position.realized_pnl + Position.unrealized_pnl))
-                    .where(Position.updated_at >= start_of_day)
-                )
-                daily_pnl = result.scalar() or Decimal('0')
-                
-                # Get portfolio value
-                portfolio_value = await self._get_portfolio_value()
-                
-                # Check daily loss limit
-                daily_loss_pct = abs(daily_pnl) / portfolio_value
-                if daily_loss_pct > self.max_daily_loss:
-                    logger.warning(f"Daily loss limit exceeded: {daily_loss_pct:.2%}")
-                    return False
-                    
-            return True
+        # Get today's PnL
+        today = datetime.utcnow().date()
+        start_of_day = datetime.combine(today, datetime.min.time())
+        
+        async with _session_scope(session) as session:
+            result = await session.execute(_STMT_DAILY_PNL, {'start_of_day': start_of_day})
+            daily_pnl = float(result.scalar_one())
             
-        except Exception as e:
-            logger.error(f"Error checking daily limits: {e}")
-            return False
+        # Check daily loss limit
+        daily_loss_pct = abs(daily_pnl) / portfolio_value
+        passed = daily_loss_pct <= self.max_daily_loss
+        if not passed:
+            logger.warning(f"Daily loss limit exceeded: {daily_loss_pct:.2%}")
             
-    async def _check_leverage_limits(self, signal: Dict) -> bool:
+        self._daily_limit_cache = (now + DAILY_LIMIT_TTL, passed)
+        return passed
+        
+    def _check_leverage_limits(self, signal: Dict) -> bool:
         """Check leverage limits"""
-        try:
-            leverage = signal.get('leverage', 1)
-            if leverage > self.max_leverage:
-                logger.warning(f"Leverage exceeds limit: {leverage} > {self.max_leverage}")
-                return False
-                
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error checking leverage limits: {e}")
+        leverage = signal.get('leverage', 1)
+        if leverage > self.max_leverage:
+            logger.warning(f"Leverage exceeds limit: {leverage} > {self.max_leverage}")
             return False
             
-    async def _get_portfolio_value(self) -> Decimal:
+        return True
+        
+    async def _get_portfolio_value(self) -> float:
         """Get current portfolio value"""
+        now = time.monotonic()
+        if self._pv_cache is not None and self._pv_cache[0] > now:
+            return self._pv_cache[1]
+            
         # This would integrate with exchange API
         # For now, return a default value
-        return Decimal('10000')
-        
-    async def _calculate_correlation(self, symbol1: str, symbol2: str) -> Decimal:
-        """Calculate correlation between two symbols"""
-        # This would use actual price data to calculate correlation
-        # For now, return a random value for demonstration
-        import random
-        return Decimal(str(random.uniform(0.1, 0.9)))
+        portfolio_value = 10000.0
+        self._pv_cache = (now + PORTFOLIO_VALUE_TTL, portfolio_value)
+        return portfolio_value
         
     async def calculate_position_size(self, signal: Dict, strategy: Strategy) -> Decimal:
         """Calculate optimal position size based on risk parameters"""
@@ -181,72 +448,66 @@ class RiskManager:
             # Get portfolio value
             portfolio_value = await self._get_portfolio_value()
             
-            # Base position size from strategy
-            base_size = portfolio_value * strategy.max_position_size
+            # Strategy-derived factors, recomputed only when its stats change
+            max_position_size, kelly_fraction = self._get_strategy_sizing(strategy)
             
-            # Adjust for signal confidence
+            # Base size adjusted for signal confidence and risk score
             confidence = signal.get('confidence', 0.5)
-            confidence_adjusted = base_size * Decimal(str(confidence))
-            
-            # Adjust for risk score
             risk_score = signal.get('risk_score', 50)
-            risk_adjusted = confidence_adjusted * (Decimal(str(risk_score)) / Decimal('100'))
-            
-            # Apply Kelly Criterion (simplified)
-            win_rate = strategy.winning_trades / strategy.total_trades if strategy.total_trades > 0 else 0.5
-            avg_win = strategy.total_pnl / strategy.winning_trades if strategy.winning_trades > 0 else 0.02
-            avg_loss = abs(strategy.total_pnl / (strategy.total_trades - strategy.winning_trades)) if strategy.total_trades > strategy.winning_trades else 0.01
+            kelly_adjusted = (
+                portfolio_value * max_position_size * confidence * (risk_score / 100) * kelly_fraction
+            )
             
-            if avg_loss > 0:
-                kelly_fraction = (win_rate * avg_win - (1 - win_rate) * avg_loss) / avg_win
-                kelly_fraction = max(0, min(kelly_fraction, 0.25))  # Cap at 25%
-                kelly_adjusted = risk_adjusted * Decimal(str(kelly_fraction))
-            else:
-                kelly_adjusted = risk_adjusted
-                
             # Convert to quantity
             price = signal.get('price', 1)
-            quantity = kelly_adjusted / Decimal(str(price))
+            quantity = kelly_adjusted / price
             
-            return max(quantity, Decimal('0'))
+            return Decimal(repr(max(quantity, 0.0)))
             
         except Exception as e:
             logger.error(f"Error calculating position size: {e}")
             return Decimal('0')
             
-    async def get_risk_metrics(self) -> Dict:
+    def _get_strategy_sizing(self, strategy: Strategy) -> Tuple[float, float]:
+        """Return (max_position_size, kelly_fraction) for a strategy as floats"""
+        stats = (
+            strategy.max_position_size,
+            strategy.total_trades or 0,
+            strategy.winning_trades or 0,
+            strategy.total_pnl or 0,
+        )
+        cached = self._sizing_cache.get(strategy.id)
+        if cached is not None and cached[0] == stats:
+            return cached[1]
+            
+        max_position_size, total_trades, winning_trades, total_pnl = stats
+        total_pnl = float(total_pnl)
+        win_rate = winning_trades / total_trades if total_trades > 0 else 0.5
+        avg_win = total_pnl / winning_trades if winning_trades > 0 else 0.02
+        avg_loss = abs(total_pnl / (total_trades - winning_trades)) if total_trades > winning_trades else 0.01
+        
+        sizing = (float(max_position_size), _kelly(win_rate, avg_win, avg_loss))
+        self._sizing_cache[strategy.id] = (stats, sizing)
+        return sizing
+        
+    async def get_risk_metrics(self, session: Optional[AsyncSession] = None) -> Dict:
         """Get current risk metrics"""
         try:
-            async with get_async_session() as session:
-                # Get latest risk metrics
-                result = await session.execute(
-                    select(RiskMetrics).order_by(desc(RiskMetrics.calculated_at)).limit(1)
-                )
-                metrics = result.scalar_one_or_none()
+            async with _session_scope(session) as session:
+                result = await session.execute(_STMT_RISK_SUMMARY)
+                metrics = result.first()
                 
                 if not metrics:
                     return {}
                     
-                # Get position count
-                result = await session.execute(
-                    select(func.count(Position.id)).where(Position.is_active == True)
-                )
-                position_count = result.scalar() or 0
-                
-                # Get open orders count
-                result = await session.execute(
-                    select(func.count(Order.id)).where(Order.status == 'pending')
-                )
-                open_orders = result.scalar() or 0
-                
                 return {
                     "total_equity": float(metrics.total_equity),
                     "available_margin": float(metrics.available_margin),
                     "used_margin": float(metrics.used_margin),
                     "daily_pnl": float(metrics.daily_pnl),
                     "daily_trades": metrics.daily_trades,
-                    "position_count": position_count,
-                    "open_orders": open_orders,
+                    "position_count": metrics.pc or 0,
+                    "open_orders": metrics.oc or 0,
                     "portfolio_var": float(metrics.portfolio_var) if metrics.portfolio_var else 0,
                     "max_drawdown": float(metrics.max_drawdown) if metrics.max_drawdown else 0,
                     "sharpe_ratio": float(metrics.sharpe_ratio) if metrics.sharpe_ratio else 0
@@ -260,19 +521,19 @@ class RiskManager:
         """Update risk management parameters"""
         try:
             if 'max_portfolio_risk' in params:
-                self.max_portfolio_risk = Decimal(str(params['max_portfolio_risk']))
+                self.max_portfolio_risk = float(params['max_portfolio_risk'])
                 
             if 'max_daily_loss' in params:
-                self.max_daily_loss = Decimal(str(params['max_daily_loss']))
+                self.max_daily_loss = float(params['max_daily_loss'])
                 
             if 'max_correlation' in params:
-                self.max_correlation = Decimal(str(params['max_correlation']))
+                self.max_correlation = float(params['max_correlation'])
                 
             if 'max_leverage' in params:
-                self.max_leverage = Decimal(str(params['max_leverage']))
+                self.max_leverage = float(params['max_leverage'])
                 
             if 'min_confidence' in params:
-                self.min_confidence = Decimal(str(params['min_confidence']))
+                self.min_confidence = float(params['min_confidence'])
                 
             logger.info(f"Risk parameters updated: {params}")
             
@@ -284,63 +545,32 @@ class RiskManager:
         logger.critical("EMERGENCY STOP - Closing all positions and orders")
         
         try:
-            async with get_async_session() as session:
-                # Cancel all pending orders
-                result = await session.execute(
-                    select(Order).where(Order.status == 'pending')
-                )
-                orders = result.scalars().all()
+            # Core statements on a plain connection: no ORM session or
+            # unit-of-work bookkeeping on the latency-critical path
+            async with engine.begin() as conn:
+                await conn.execute(_STMT_CANCEL_PENDING_ORDERS)
+                await conn.execute(_STMT_CLOSE_ACTIVE_POSITIONS, {'closed_at': datetime.utcnow()})
                 
-                for order in orders:
-                    order.status = 'cancelled'
-                    
-                # Close all positions
-                result = await session.execute(
-                    select(Position).where(Position.is_active == True)
-                )
-                positions = result.scalars().all()
-                
-                for position in positions:
-                    position.is_active = False
-                    position.closed_at = datetime.utcnow()
-                    
-                await session.commit()
-                logger.info("Emergency stop completed")
+            logger.info("Emergency stop completed")
                 
         except Exception as e:
             logger.error(f"Error in emergency stop: {e}")
             
-    async def get_portfolio_heatmap(self) -> Dict:
+    async def get_portfolio_heatmap(self, session: Optional[AsyncSession] = None) -> Dict:
         """Get portfolio risk heatmap"""
         try:
-            async with get_async_session() as session:
-                # Get all positions with their risk metrics
-                result = await session.execute(
-                    select(Position).where(Position.is_active == True)
-                )
-                positions = result.scalars().all()
-                
-                heatmap_data = {}
-                for position in positions:
-                    # Calculate position risk metrics
-                    position_value = position.quantity * position.current_price
-                    portfolio_value = await self._get_portfolio_value()
-                    weight = position_value / portfolio_value
-                    
-                    # Calculate VaR (simplified)
-                    volatility = Decimal('0.02')  # 2% daily volatility
-                    var_95 = position_value * volatility * Decimal('1.645')  # 95% VaR
-                    
-                    heatmap_data[position.symbol] = {
-                        "weight": float(weight),
-                        "value": float(position_value),
-                        "var_95": float(var_95),
-                        "unrealized_pnl": float(position.unrealized_pnl),
-                        "pnl_percentage": float((position.current_price - position.entry_price) / position.entry_price * 100)
-                    }
+            portfolio_value = await self._get_portfolio_value()
+            
+            heatmap_data = {}
+            async with _session_scope(session) as session:
+                # Stream positions through a server-side cursor so memory
+                # stays bounded for large portfolios
+                result = await session.stream(_STMT_HEATMAP_POSITIONS)
+                async for positions in result.partitions():
+                    heatmap_data.update(_heatmap_chunk(positions, portfolio_value))
                     
-                return heatmap_data
-                
+            return heatmap_data
+            
         except Exception as e:
             logger.error(f"Error getting portfolio heatmap: {e}")
             return {}
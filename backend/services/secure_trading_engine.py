@@ -4,20 +4,23 @@ Handles secure trading operations using encrypted credentials
 """
 
 import asyncio
-import json
+import os
+import orjson
 import time
+import uuid
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 import structlog
 import redis.asyncio as redis
 from prometheus_client import Counter, Gauge, Histogram
 import ccxt.async_support as ccxt
-from .secure_credential_manager import credential_manager, ExchangeCredentials
+from .secure_credential_manager import get_credential_manager, ExchangeCredentials
 
 logger = structlog.get_logger()
 
-@dataclass
+@dataclass(slots=True)
 class OrderRequest:
     user_id: str
     exchange: str
@@ -29,8 +32,24 @@ class OrderRequest:
     stop_price: Optional[float] = None
     time_in_force: str = 'GTC'  # Good Till Cancelled
     client_order_id: Optional[str] = None
+    
+    def create_order_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for ccxt's create_order(symbol, type, side, amount, price, params)"""
+        params = {'timeInForce': self.time_in_force}
+        if self.stop_price:
+            params['stopPrice'] = self.stop_price
+        if self.client_order_id:
+            params['clientOrderId'] = self.client_order_id
+        return {
+            'symbol': self.symbol,
+            'type': self.type,
+            'side': self.side,
+            'amount': self.amount,
+            'price': self.price or None,
+            'params': params,
+        }
 
-@dataclass
+@dataclass(slots=True)
 class OrderResult:
     order_id: str
     symbol: str
@@ -46,8 +65,13 @@ class OrderResult:
     client_order_id: Optional[str] = None
     fees: Optional[Dict[str, float]] = None
     error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field dict; unlike asdict() it does not deep-copy fees"""
+        # With slots=True, __slots__ is the field names in declaration order
+        return {name: getattr(self, name) for name in self.__slots__}
 
-@dataclass
+@dataclass(slots=True)
 class Balance:
     exchange: str
     currency: str
@@ -56,7 +80,7 @@ class Balance:
     total: float
     timestamp: float
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     exchange: str
     symbol: str
@@ -67,25 +91,109 @@ class Position:
     unrealized_pnl: float
     timestamp: float
 
+# Exchange REST round-trips; the default buckets are mostly sub-10ms
+TRADING_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+# Authenticated ccxt clients kept per (exchange, user); each holds an HTTP
+# session and a markets dict, so idle ones are closed
+EXCHANGE_INSTANCE_CACHE_SIZE = 1024
+EXCHANGE_INSTANCE_IDLE_TTL = 600.0  # seconds
+EXCHANGE_REAPER_INTERVAL = 60.0  # seconds
+
+# last_used is only needed at coarse resolution, so credential touches are batched
+LAST_USED_FLUSH_INTERVAL = 5.0  # seconds
+
+# Orders are written to Redis by a background task, up to this many per round trip
+ORDER_STORE_BATCH_SIZE = 128
+ORDER_STORE_TTL = 86400  # 24 hours
+
+# Sliding-window limit per (exchange, operation), shared by every worker via Redis
+RATE_LIMIT_WINDOW_MS = 1000
+RATE_LIMIT_MAX_OPS = 10
+
+# Admits the request and returns 0, or returns the milliseconds until the
+# oldest entry leaves the window. Uses the Redis clock so workers agree.
+_RATE_LIMIT_LUA = """
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local window = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return 0
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return math.max(1, tonumber(oldest[2]) + window - now)
+"""
+
+# Quote currencies reported as their own metric label; anything else is "other"
+METRIC_QUOTE_BUCKETS = frozenset({"USDT", "USDC", "USD", "BTC", "ETH"})
+
+
+def _quote_bucket(symbol: str) -> str:
+    """Bounded quote-currency label for a ccxt symbol such as BTC/USDT or BTC/USDT:USDT"""
+    quote = symbol.partition("/")[2].partition(":")[0].upper()
+    return quote if quote in METRIC_QUOTE_BUCKETS else "other"
+
+
+# Counters with the most series per engine; METRICS_LOW_CARD=1 skips registering them
+HIGH_CARD_METRICS = frozenset({"trading_volume_total", "trading_fees_total"})
+METRICS_LOW_CARD = os.getenv("METRICS_LOW_CARD") == "1"
+
+
+class _NoopCounter:
+    """Stand-in for a Counter that is not exported"""
+    
+    def labels(self, *args, **kwargs) -> "_NoopCounter":
+        return self
+    
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+
+def _counter(name: str, documentation: str, labelnames: List[str]):
+    if METRICS_LOW_CARD and name in HIGH_CARD_METRICS:
+        return _NoopCounter()
+    return Counter(name, documentation, labelnames)
+
+
 class SecureTradingEngine:
     def __init__(self):
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
         self.redis = redis.from_url(self.redis_url, decode_responses=True)
         
         # Metrics
-        self.orders_placed = Counter("orders_placed_total", "Orders placed", ["exchange", "symbol", "side"])
-        self.orders_filled = Counter("orders_filled_total", "Orders filled", ["exchange", "symbol", "side"])
-        self.orders_cancelled = Counter("orders_cancelled_total", "Orders cancelled", ["exchange", "symbol", "side"])
-        self.trading_volume = Counter("trading_volume_total", "Trading volume", ["exchange", "symbol"])
-        self.trading_fees = Counter("trading_fees_total", "Trading fees paid", ["exchange", "currency"])
-        self.trading_latency = Histogram("trading_latency_seconds", "Trading operation latency", ["exchange", "operation"])
+        # Labels are kept to bounded sets; per-symbol detail goes to the logs
+        self.orders_placed = Counter("orders_placed_total", "Orders placed", ["exchange", "side"])
+        self.orders_filled = Counter("orders_filled_total", "Orders filled", ["exchange", "side"])
+        self.orders_cancelled = Counter("orders_cancelled_total", "Orders cancelled", ["exchange"])
+        # Series that slip through anyway are dropped at scrape time, see docker/prometheus/prometheus.yml
+        self.trading_volume = _counter("trading_volume_total", "Trading volume", ["exchange", "quote"])
+        self.trading_fees = _counter("trading_fees_total", "Trading fees paid", ["exchange"])
+        self.trading_latency = Histogram(
+            "trading_latency_seconds", "Trading operation latency", ["exchange", "operation"],
+            buckets=TRADING_LATENCY_BUCKETS
+        )
+        # Bound (exchange, operation) children, so the hot path skips labels()
+        self._latency_children: Dict[Tuple[str, str], Any] = {}
         self.active_orders = Gauge("active_orders", "Active orders", ["exchange"])
         
-        # Exchange instances cache
-        self.exchange_instances: Dict[str, ccxt.Exchange] = {}
+        # Exchange instances cache: key -> (last used, instance), least recently used first
+        self.exchange_instances: "OrderedDict[str, Tuple[float, ccxt.Exchange]]" = OrderedDict()
+        self._reaper_task: Optional[asyncio.Task] = None
+        
+        # (user_id, exchange) pairs whose last_used is written by the next flush
+        self._pending_touch: set = set()
+        self._touch_task: Optional[asyncio.Task] = None
+        self._closing: set = set()
+        
+        # Orders waiting to be written by _store_orders_forever
+        self._store_queue: "asyncio.Queue[OrderResult]" = asyncio.Queue()
+        self._store_task: Optional[asyncio.Task] = None
         
         # Rate limiting
-        self.rate_limits: Dict[str, Dict[str, float]] = {}
+        self._rate_script = self.redis.register_script(_RATE_LIMIT_LUA)
     
     async def initialize(self):
         """Initialize the trading engine"""
@@ -100,9 +208,13 @@ class SecureTradingEngine:
         """Get or create exchange instance with credentials"""
         try:
             cache_key = f"{credentials.exchange}_{credentials.user_id}"
+            now = time.monotonic()
             
-            if cache_key in self.exchange_instances:
-                return self.exchange_instances[cache_key]
+            entry = self.exchange_instances.get(cache_key)
+            if entry is not None:
+                self.exchange_instances[cache_key] = (now, entry[1])
+                self.exchange_instances.move_to_end(cache_key)
+                return entry[1]
             
             # Create exchange instance
             exchange_class = getattr(ccxt, credentials.exchange)
@@ -120,8 +232,15 @@ class SecureTradingEngine:
             
             exchange = exchange_class(config)
             
-            # Cache the instance
-            self.exchange_instances[cache_key] = exchange
+            # Cache the instance. Nothing above awaits, so concurrent callers
+            # cannot both miss and build duplicates for the same key.
+            self.exchange_instances[cache_key] = (now, exchange)
+            while len(self.exchange_instances) > EXCHANGE_INSTANCE_CACHE_SIZE:
+                _, (_, evicted) = self.exchange_instances.popitem(last=False)
+                self._schedule_close(evicted)
+            
+            if self._reaper_task is None or self._reaper_task.done():
+                self._reaper_task = asyncio.create_task(self._reap_idle_instances())
             
             return exchange
             
@@ -129,22 +248,72 @@ class SecureTradingEngine:
             logger.error(f"Failed to create exchange instance for {credentials.exchange}", error=str(e))
             raise
     
+    def _schedule_close(self, exchange: ccxt.Exchange):
+        task = asyncio.create_task(exchange.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    async def _reap_idle_instances(self):
+        """Close exchange instances that have not been used for EXCHANGE_INSTANCE_IDLE_TTL"""
+        while self.exchange_instances:
+            await asyncio.sleep(EXCHANGE_REAPER_INTERVAL)
+            cutoff = time.monotonic() - EXCHANGE_INSTANCE_IDLE_TTL
+            # LRU order: stop at the first instance used since the cutoff
+            while self.exchange_instances:
+                key, (last_used, exchange) = next(iter(self.exchange_instances.items()))
+                if last_used > cutoff:
+                    break
+                del self.exchange_instances[key]
+                self._schedule_close(exchange)
+    
+    def _observe_latency(self, exchange: str, operation: str, seconds: float):
+        key = (exchange, operation)
+        child = self._latency_children.get(key)
+        if child is None:
+            child = self._latency_children[key] = self.trading_latency.labels(
+                exchange=exchange, operation=operation
+            )
+        child.observe(seconds)
+    
+    def _touch_credentials(self, user_id: str, exchange: str):
+        """Queue a last_used update; writes are batched every LAST_USED_FLUSH_INTERVAL"""
+        self._pending_touch.add((user_id, exchange))
+        if self._touch_task is None or self._touch_task.done():
+            self._touch_task = asyncio.create_task(self._flush_touches_periodically())
+    
+    async def _flush_touches(self):
+        # Swap the set first so touches made during the writes go to the next flush
+        pending, self._pending_touch = self._pending_touch, set()
+        manager = get_credential_manager()
+        await asyncio.gather(*(manager.update_last_used(user_id, exchange) for user_id, exchange in pending))
+    
+    async def _flush_touches_periodically(self):
+        while self._pending_touch:
+            await asyncio.sleep(LAST_USED_FLUSH_INTERVAL)
+            await self._flush_touches()
+    
+    def _on_auth_error(self, user_id: str, exchange: str, error: Exception):
+        """Drop cached credentials and client after the exchange rejects the keys"""
+        if not isinstance(error, ccxt.AuthenticationError):
+            return
+        # The keys may have been rotated since they were cached
+        get_credential_manager().invalidate_cached(user_id, exchange)
+        entry = self.exchange_instances.pop(f"{exchange}_{user_id}", None)
+        if entry is not None:
+            self._schedule_close(entry[1])
+    
     async def _check_rate_limit(self, exchange: str, operation: str) -> bool:
         """Check if we can perform an operation without hitting rate limits"""
         try:
-            current_time = time.time()
-            
-            if exchange not in self.rate_limits:
-                self.rate_limits[exchange] = {}
-            
-            last_operation = self.rate_limits[exchange].get(operation, 0)
-            
-            # Simple rate limiting - 1 operation per second per exchange
-            if current_time - last_operation < 1.0:
-                await asyncio.sleep(1.0 - (current_time - last_operation))
-            
-            self.rate_limits[exchange][operation] = time.time()
-            return True
+            key = f"rl:{exchange}:{operation}"
+            request_id = uuid.uuid4().hex
+            while True:
+                wait_ms = await self._rate_script(
+                    keys=[key], args=[RATE_LIMIT_WINDOW_MS, RATE_LIMIT_MAX_OPS, request_id]
+                )
+                if not wait_ms:
+                    return True
+                await asyncio.sleep(int(wait_ms) / 1000)
             
         except Exception as e:
             logger.error("Rate limit check failed", error=str(e))
@@ -153,10 +322,10 @@ class SecureTradingEngine:
     async def place_order(self, order_request: OrderRequest) -> OrderResult:
         """Place a trading order"""
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             
             # Get credentials
-            credentials = await credential_manager.get_credentials(
+            credentials = await get_credential_manager().get_credentials(
                 order_request.user_id, 
                 order_request.exchange
             )
@@ -183,49 +352,21 @@ class SecureTradingEngine:
             # Get exchange instance
             exchange = await self._get_exchange_instance(credentials)
             
-            # Prepare order parameters
-            order_params = {
-                'symbol': order_request.symbol,
-                'side': order_request.side,
-                'type': order_request.type,
-                'amount': order_request.amount,
-                'timeInForce': order_request.time_in_force,
-            }
-            
-            if order_request.price:
-                order_params['price'] = order_request.price
-            
-            if order_request.stop_price:
-                order_params['stopPrice'] = order_request.stop_price
-            
-            if order_request.client_order_id:
-                order_params['clientOrderId'] = order_request.client_order_id
-            
             # Place order
-            order = await exchange.create_order(**order_params)
+            order = await exchange.create_order(**order_request.create_order_kwargs())
             
             # Update metrics
             self.orders_placed.labels(
                 exchange=order_request.exchange,
-                symbol=order_request.symbol,
                 side=order_request.side
             ).inc()
             
             self.trading_volume.labels(
                 exchange=order_request.exchange,
-                symbol=order_request.symbol
+                quote=_quote_bucket(order_request.symbol)
             ).inc(order_request.amount)
             
-            self.trading_latency.labels(
-                exchange=order_request.exchange,
-                operation="place_order"
-            ).observe(time.time() - start_time)
-            
-            # Update last used timestamp
-            await credential_manager.update_last_used(
-                order_request.user_id, 
-                order_request.exchange
-            )
+            self._observe_latency(order_request.exchange, "place_order", time.monotonic() - start_time)
             
             # Create result
             result = OrderResult(
@@ -244,14 +385,23 @@ class SecureTradingEngine:
                 fees=order.get('fees')
             )
             
+            # Update last used timestamp
+            self._touch_credentials(order_request.user_id, order_request.exchange)
+            
             # Store order in Redis for tracking
             await self._store_order(result)
             
-            logger.info(f"Order placed: {result.order_id} on {order_request.exchange}")
+            logger.info(
+                f"Order placed: {result.order_id} on {order_request.exchange}",
+                symbol=order_request.symbol,
+                side=order_request.side,
+                amount=order_request.amount
+            )
             return result
             
         except Exception as e:
             logger.error("Failed to place order", error=str(e))
+            self._on_auth_error(order_request.user_id, order_request.exchange, e)
             return OrderResult(
                 order_id="",
                 symbol=order_request.symbol,
@@ -270,10 +420,10 @@ class SecureTradingEngine:
     async def cancel_order(self, user_id: str, exchange: str, order_id: str) -> bool:
         """Cancel an order"""
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             
             # Get credentials
-            credentials = await credential_manager.get_credentials(user_id, exchange)
+            credentials = await get_credential_manager().get_credentials(user_id, exchange)
             if not credentials:
                 return False
             
@@ -287,32 +437,26 @@ class SecureTradingEngine:
             await exchange_instance.cancel_order(order_id)
             
             # Update metrics
-            self.orders_cancelled.labels(
-                exchange=exchange,
-                symbol="unknown",  # Would need to get from order
-                side="unknown"
-            ).inc()
+            self.orders_cancelled.labels(exchange=exchange).inc()
             
-            self.trading_latency.labels(
-                exchange=exchange,
-                operation="cancel_order"
-            ).observe(time.time() - start_time)
+            self._observe_latency(exchange, "cancel_order", time.monotonic() - start_time)
             
             # Update last used timestamp
-            await credential_manager.update_last_used(user_id, exchange)
+            self._touch_credentials(user_id, exchange)
             
             logger.info(f"Order cancelled: {order_id} on {exchange}")
             return True
             
         except Exception as e:
             logger.error("Failed to cancel order", error=str(e))
+            self._on_auth_error(user_id, exchange, e)
             return False
     
     async def get_order_status(self, user_id: str, exchange: str, order_id: str) -> Optional[OrderResult]:
         """Get order status"""
         try:
             # Get credentials
-            credentials = await credential_manager.get_credentials(user_id, exchange)
+            credentials = await get_credential_manager().get_credentials(user_id, exchange)
             if not credentials:
                 return None
             
@@ -326,7 +470,7 @@ class SecureTradingEngine:
             order = await exchange_instance.fetch_order(order_id)
             
             # Update last used timestamp
-            await credential_manager.update_last_used(user_id, exchange)
+            self._touch_credentials(user_id, exchange)
             
             # Create result
             result = OrderResult(
@@ -349,13 +493,14 @@ class SecureTradingEngine:
             
         except Exception as e:
             logger.error("Failed to get order status", error=str(e))
+            self._on_auth_error(user_id, exchange, e)
             return None
     
     async def get_balance(self, user_id: str, exchange: str) -> List[Balance]:
         """Get account balance"""
         try:
             # Get credentials
-            credentials = await credential_manager.get_credentials(user_id, exchange)
+            credentials = await get_credential_manager().get_credentials(user_id, exchange)
             if not credentials:
                 return []
             
@@ -369,32 +514,28 @@ class SecureTradingEngine:
             balance = await exchange_instance.fetch_balance()
             
             # Update last used timestamp
-            await credential_manager.update_last_used(user_id, exchange)
+            self._touch_credentials(user_id, exchange)
             
             # Convert to Balance objects
-            balances = []
-            for currency, data in balance.items():
-                if isinstance(data, dict) and 'free' in data:
-                    balances.append(Balance(
-                        exchange=exchange,
-                        currency=currency,
-                        free=data.get('free', 0),
-                        used=data.get('used', 0),
-                        total=data.get('total', 0),
-                        timestamp=time.time()
-                    ))
+            ts = time.time()
+            balances = [
+                Balance(exchange, currency, data.get('free', 0), data.get('used', 0), data.get('total', 0), ts)
+                for currency, data in balance.items()
+                if isinstance(data, dict) and 'free' in data
+            ]
             
             return balances
             
         except Exception as e:
             logger.error("Failed to get balance", error=str(e))
+            self._on_auth_error(user_id, exchange, e)
             return []
     
     async def get_positions(self, user_id: str, exchange: str) -> List[Position]:
         """Get open positions"""
         try:
             # Get credentials
-            credentials = await credential_manager.get_credentials(user_id, exchange)
+            credentials = await get_credential_manager().get_credentials(user_id, exchange)
             if not credentials:
                 return []
             
@@ -409,7 +550,7 @@ class SecureTradingEngine:
                 positions = await exchange_instance.fetch_positions()
                 
                 # Update last used timestamp
-                await credential_manager.update_last_used(user_id, exchange)
+                self._touch_credentials(user_id, exchange)
                 
                 # Convert to Position objects
                 position_list = []
@@ -432,13 +573,14 @@ class SecureTradingEngine:
             
         except Exception as e:
             logger.error("Failed to get positions", error=str(e))
+            self._on_auth_error(user_id, exchange, e)
             return []
     
     async def get_open_orders(self, user_id: str, exchange: str, symbol: Optional[str] = None) -> List[OrderResult]:
         """Get open orders"""
         try:
             # Get credentials
-            credentials = await credential_manager.get_credentials(user_id, exchange)
+            credentials = await get_credential_manager().get_credentials(user_id, exchange)
             if not credentials:
                 return []
             
@@ -452,7 +594,7 @@ class SecureTradingEngine:
             orders = await exchange_instance.fetch_open_orders(symbol)
             
             # Update last used timestamp
-            await credential_manager.update_last_used(user_id, exchange)
+            self._touch_credentials(user_id, exchange)
             
             # Convert to OrderResult objects
             order_results = []
@@ -477,23 +619,46 @@ class SecureTradingEngine:
             
         except Exception as e:
             logger.error("Failed to get open orders", error=str(e))
+            self._on_auth_error(user_id, exchange, e)
             return []
     
     async def _store_order(self, order: OrderResult):
-        """Store order in Redis for tracking"""
-        try:
+        """Queue order for storage in Redis; writes are pipelined in batches"""
+        self._store_queue.put_nowait(order)
+        if self._store_task is None or self._store_task.done():
+            self._store_task = asyncio.create_task(self._store_orders_forever())
+    
+    async def _write_orders(self, orders: List[OrderResult]):
+        # One hash field per attribute so readers can HMGET just what they need
+        pipe = self.redis.pipeline(transaction=True)
+        for order in orders:
             key = f"order:{order.exchange}:{order.order_id}"
-            data = asdict(order)
-            await self.redis.setex(key, 86400, json.dumps(data))  # 24 hours
-            
-        except Exception as e:
-            logger.error("Failed to store order", error=str(e))
+            pipe.delete(key)  # entries written before the hash layout were plain strings
+            pipe.hset(key, mapping={
+                field: orjson.dumps(value, default=str) for field, value in order.to_dict().items()
+            })
+            pipe.expire(key, ORDER_STORE_TTL)
+        await pipe.execute()
+    
+    async def _store_orders_forever(self):
+        queue = self._store_queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < ORDER_STORE_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._write_orders(batch)
+            except Exception as e:
+                logger.error("Failed to store orders", count=len(batch), error=str(e))
+            finally:
+                for _ in batch:
+                    queue.task_done()
     
     async def get_order_history(self, user_id: str, exchange: str, symbol: Optional[str] = None, limit: int = 100) -> List[OrderResult]:
         """Get order history"""
         try:
             # Get credentials
-            credentials = await credential_manager.get_credentials(user_id, exchange)
+            credentials = await get_credential_manager().get_credentials(user_id, exchange)
             if not credentials:
                 return []
             
@@ -507,7 +672,7 @@ class SecureTradingEngine:
             orders = await exchange_instance.fetch_orders(symbol, limit=limit)
             
             # Update last used timestamp
-            await credential_manager.update_last_used(user_id, exchange)
+            self._touch_credentials(user_id, exchange)
             
             # Convert to OrderResult objects
             order_results = []
@@ -532,12 +697,28 @@ class SecureTradingEngine:
             
         except Exception as e:
             logger.error("Failed to get order history", error=str(e))
+            self._on_auth_error(user_id, exchange, e)
             return []
     
     async def close(self):
         """Close all exchange connections"""
         try:
-            for exchange in self.exchange_instances.values():
+            if self._reaper_task:
+                self._reaper_task.cancel()
+            
+            if self._touch_task:
+                self._touch_task.cancel()
+            await self._flush_touches()
+            
+            if self._store_task:
+                # Let queued orders reach Redis before the connection goes away
+                try:
+                    await asyncio.wait_for(self._store_queue.join(), timeout=5)
+                except asyncio.TimeoutError:
+                    logger.warning("Dropped unstored orders on close", count=self._store_queue.qsize())
+                self._store_task.cancel()
+            
+            for _, exchange in self.exchange_instances.values():
                 if hasattr(exchange, 'close'):
                     await exchange.close()
             
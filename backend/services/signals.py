@@ -3,12 +3,115 @@ Signal service using public Binance data for non-placeholder signals
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from dataclasses import dataclass
+import asyncio
+import functools
+import heapq
+import orjson
+import time
 import aiohttp
 
 
 BINANCE_BASE = "https://api.binance.com"
+KLINES_CONCURRENCY = 20
+# /api/v3/ticker rolling window matching six 5m klines
+RECENT_MOVE_WINDOW = "30m"
+ROLLING_TICKER_MAX_SYMBOLS = 100
+
+# One pooled session for every SignalService, so keep-alive connections and
+# TLS sessions to Binance are reused across requests
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+	global _http_session
+	if _http_session is None or _http_session.closed:
+		connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60)
+		_http_session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=20))
+	return _http_session
+
+
+# Entry maps of every _async_ttl_cache, cleared on shutdown
+_ttl_caches: List["OrderedDict[Any, Any]"] = []
+
+
+def _async_ttl_cache(maxsize: int, ttl: float):
+	"""Cache a SignalService coroutine method's result per arguments for ttl seconds.
+
+	The cache is shared by all instances (the Binance data does not depend on
+	the session). Concurrent callers with the same arguments await one request;
+	failures are not cached.
+	"""
+	def decorator(method):
+		entries: "OrderedDict[Any, Any]" = OrderedDict()  # key -> (expires_at, task)
+
+		@functools.wraps(method)
+		async def wrapper(self, *args, **kwargs):
+			key = (args, tuple(sorted(kwargs.items())))
+			now = time.monotonic()
+			entry = entries.get(key)
+			if entry is None or entry[0] <= now:
+				task = asyncio.ensure_future(method(self, *args, **kwargs))
+				entry = entries[key] = (now + ttl, task)
+				while len(entries) > maxsize:
+					entries.popitem(last=False)
+			entries.move_to_end(key)
+			task = entry[1]
+			try:
+				# Shielded so one caller going away does not cancel the shared request
+				return await asyncio.shield(task)
+			except Exception:
+				if entries.get(key) is entry:
+					del entries[key]
+				raise
+
+		wrapper.cache_clear = entries.clear
+		_ttl_caches.append(entries)
+		return wrapper
+	return decorator
+
+
+async def close_http_session() -> None:
+	"""Close the shared Binance session and drop cached responses (application shutdown)"""
+	global _http_session
+	for entries in _ttl_caches:
+		entries.clear()
+	if _http_session is not None:
+		await _http_session.close()
+		_http_session = None
+
+
+@dataclass(slots=True, frozen=True)
+class Signal:
+	"""Active signal; fields match schemas.signals.SignalResponse"""
+	signal_id: str
+	signal_type: str
+	primary_symbol: str
+	secondary_symbol: Optional[str]
+	exchange: str
+	interval: str
+	direction: str
+	strength: float
+	confidence: float
+	trigger_price: float
+	trigger_time: datetime
+	expected_duration: Optional[int]
+	historical_hit_rate: float
+	historical_profit_factor: Optional[float]
+	avg_return: Optional[float]
+	stop_loss: Optional[float]
+	take_profit: Optional[float]
+	position_size: Optional[float]
+	metadata: Optional[Dict[str, Any]]
+	regime_context: Optional[str]
+	status: str
+	triggered_at: Optional[datetime]
+	expired_at: Optional[datetime]
+	created_at: datetime
+	updated_at: datetime
 
 
 class SignalService:
@@ -17,20 +120,24 @@ class SignalService:
 
 	async def _get(self, path: str, params: Optional[Dict[str, Any]] = None):
 		url = f"{BINANCE_BASE}{path}"
-		async with aiohttp.ClientSession() as session:
-			async with session.get(url, params=params, timeout=20) as resp:
-				resp.raise_for_status()
-				return await resp.json()
+		async with _get_http_session().get(url, params=params) as resp:
+			resp.raise_for_status()
+			# orjson parses the large ticker payloads several times faster than aiohttp's json path
+			return orjson.loads(await resp.read())
 
+	@_async_ttl_cache(maxsize=8, ttl=15)
 	async def _top_usdt_movers(self, limit: int = 50):
 		rows = await self._get('/api/v3/ticker/24hr')
 		usdt = [r for r in rows if r.get('symbol', '').endswith('USDT')]
-		for r in usdt:
+		# Partial selection of the top `limit` (same order as a full reverse sort),
+		# and only the survivors get their fields converted
+		top = heapq.nlargest(limit, usdt, key=lambda r: abs(float(r.get('priceChangePercent', 0))))
+		for r in top:
 			r['price'] = float(r.get('lastPrice', 0))
 			r['change_percent'] = float(r.get('priceChangePercent', 0))
-		usdt.sort(key=lambda r: abs(r['change_percent']), reverse=True)
-		return usdt[:limit]
+		return top
 
+	@_async_ttl_cache(maxsize=2048, ttl=10)
 	async def _recent_move(self, symbol: str, interval: str = '5m', window: int = 12):
 		# last N bars price move
 		params = {"symbol": symbol, "interval": interval, "limit": window}
@@ -42,45 +149,92 @@ class SignalService:
 		pct = (end - start) / start
 		return pct, end
 
+	@_async_ttl_cache(maxsize=8, ttl=10)
+	async def _rolling_moves(self, symbols: Tuple[str, ...]):
+		# One rolling-window ticker request covers up to ROLLING_TICKER_MAX_SYMBOLS symbols
+		params = {"symbols": orjson.dumps(list(symbols)).decode(), "windowSize": RECENT_MOVE_WINDOW}
+		rows = await self._get('/api/v3/ticker', params)
+		moves = {}
+		for row in rows:
+			start = float(row['openPrice'])
+			end = float(row['lastPrice'])
+			moves[row['symbol']] = ((end - start) / start if start else 0.0, end)
+		return moves
+
+	async def _recent_moves(self, symbols: Tuple[str, ...]) -> Dict[str, Tuple[float, Optional[float]]]:
+		"""Price move over the last ~30m for each symbol; symbols that fail are left out"""
+		chunks = [symbols[i:i + ROLLING_TICKER_MAX_SYMBOLS] for i in range(0, len(symbols), ROLLING_TICKER_MAX_SYMBOLS)]
+		results = await asyncio.gather(*(self._rolling_moves(chunk) for chunk in chunks), return_exceptions=True)
+
+		moves: Dict[str, Tuple[float, Optional[float]]] = {}
+		fallback: List[str] = []
+		for chunk, result in zip(chunks, results):
+			if isinstance(result, Exception):
+				# Binance rejects the whole batch if any symbol is invalid
+				fallback.extend(chunk)
+			else:
+				moves.update(result)
+		if not fallback:
+			return moves
+
+		# Per-symbol klines for the rejected batch, bounded for Binance's weight limit
+		semaphore = asyncio.Semaphore(KLINES_CONCURRENCY)
+
+		async def recent_move(sym: str):
+			async with semaphore:
+				return await self._recent_move(sym, '5m', 6)
+
+		for sym, move in zip(fallback, await asyncio.gather(*(recent_move(sym) for sym in fallback), return_exceptions=True)):
+			if not isinstance(move, Exception):
+				moves[sym] = move
+		return moves
+
 	async def get_active_signals(self, signal_type: Optional[str] = None, symbol: Optional[str] = None, min_strength: float = 0.5, min_confidence: float = 0.6, limit: int = 50):
 		# Heuristic signals from top movers, recent 5m movement
 		now = datetime.utcnow()
 		movers = await self._top_usdt_movers(limit=100)
-		signals: List[Dict[str, Any]] = []
+		if symbol:
+			movers = [r for r in movers if r['symbol'] == symbol]
+
+		moves = await self._recent_moves(tuple(r['symbol'] for r in movers))
+
+		signal_ts = int(now.timestamp())
+		signals: List[Signal] = []
 		for r in movers:
 			sym = r['symbol']
-			if symbol and sym != symbol:
+			if sym not in moves:
 				continue
-			recent_pct, last_price = await self._recent_move(sym, '5m', 6)
+			recent_pct, last_price = moves[sym]
 			if abs(recent_pct) < 0.01:  # at least 1% in last ~30m
 				continue
-			s = {
-				"signal_id": f"{sym}_{int(now.timestamp())}",
-				"signal_type": "breakout" if recent_pct > 0 else "breakdown",
-				"primary_symbol": sym,
-				"secondary_symbol": None,
-				"exchange": "binance",
-				"interval": "5m",
-				"direction": "long" if recent_pct > 0 else "short",
-				"strength": min(1.0, abs(recent_pct) * 10),
-				"confidence": 0.6,  # base confidence; can be enriched with hit-rate when history stored
-				"trigger_price": last_price or 0.0,
-				"trigger_time": now,
-				"expected_duration": 15,
-				"historical_hit_rate": 0.0,
-				"historical_profit_factor": None,
-				"avg_return": None,
-				"stop_loss": 0.005,
-				"take_profit": 0.01,
-				"position_size": None,
-				"metadata": {"recent_pct": recent_pct, "day_change_pct": r['change_percent']},
-				"regime_context": None,
-				"status": "active",
-				"triggered_at": None,
-				"expired_at": None,
-				"created_at": now,
-				"updated_at": now,
-			}
+			up = recent_pct > 0
+			s = Signal(
+				signal_id=f"{sym}_{signal_ts}",
+				signal_type="breakout" if up else "breakdown",
+				primary_symbol=sym,
+				secondary_symbol=None,
+				exchange="binance",
+				interval="5m",
+				direction="long" if up else "short",
+				strength=min(1.0, abs(recent_pct) * 10),
+				confidence=0.6,  # base confidence; can be enriched with hit-rate when history stored
+				trigger_price=last_price or 0.0,
+				trigger_time=now,
+				expected_duration=15,
+				historical_hit_rate=0.0,
+				historical_profit_factor=None,
+				avg_return=None,
+				stop_loss=0.005,
+				take_profit=0.01,
+				position_size=None,
+				metadata={"recent_pct": recent_pct, "day_change_pct": r['change_percent']},
+				regime_context=None,
+				status="active",
+				triggered_at=None,
+				expired_at=None,
+				created_at=now,
+				updated_at=now,
+			)
 			signals.append(s)
 			if len(signals) >= limit:
 				break
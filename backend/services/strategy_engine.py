@@ -4,22 +4,273 @@ Advanced Strategy Engine with Multiple Trading Strategies
 
 import asyncio
 import json
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 import structlog
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import Float, and_, bindparam, cast, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_async_session
 from models.market_data import Kline, Trade
 from models.trading import Strategy, StrategyType
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels also run as plain Python
+    njit = None
+
 logger = structlog.get_logger()
 
+# Columns loaded for the price-based strategies, in SELECT order
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+CLOSE = OHLCV_COLUMNS.index("close")
+
+# Rows converted to arrays per batch while streaming klines
+OHLCV_STREAM_BATCH = 5000
+
+# Cached kline windows, one per (symbol, lookback hours), least recently used first
+KLINE_WINDOW_CACHE_SIZE = 512
+# Rows this close to a window's newest kline are read again, so klines from
+# other exchanges or intervals that are written a little later are not missed
+KLINE_LATE_ARRIVAL = timedelta(minutes=15)
+# Rolling sums are recomputed from the window after this many updates to stop drift
+ROLLING_STATS_RESYNC = 100
+_NO_VALUES = np.empty(0)
+
+
+
+def _rsi_kernel(x, period):
+    """RSI over the last `period` deltas of x; x must hold at least period + 1 prices"""
+    n = len(x)
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - period, n):
+        d = x[i] - x[i - 1]
+        if d > 0:
+            gain += d
+        else:
+            loss -= d
+    if loss == 0.0:
+        return 100.0
+    # The averages share the same divisor, so the sums give the same ratio
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+def _momentum_kernel(prices, volumes, lookback, recent):
+    """(price momentum over lookback, recent-vs-lookback average volume change)"""
+    n = len(prices)
+    base = prices[n - lookback]
+    # Both volume windows end at the last kline, so one pass over the longer
+    # one fills both sums; windows longer than the data are clipped, as slicing would
+    lookback = min(lookback, n)
+    recent = min(recent, n)
+    avg_volume = 0.0
+    recent_volume = 0.0
+    for i in range(n - max(lookback, recent), n):
+        v = volumes[i]
+        if i >= n - lookback:
+            avg_volume += v
+        if i >= n - recent:
+            recent_volume += v
+    avg_volume /= lookback
+    recent_volume /= recent
+    # No volume over the lookback means no measurable change, not a division error
+    volume_ratio = (recent_volume - avg_volume) / avg_volume if avg_volume > 0 else 0.0
+    return (prices[n - 1] - base) / base, volume_ratio
+
+
+if njit is not None:
+    _rsi_kernel = njit(cache=True, fastmath=True)(_rsi_kernel)
+    _momentum_kernel = njit(cache=True, fastmath=True)(_momentum_kernel)
+
+# Statements are built once; each call only binds new parameters.
+# Only the needed columns, ordered by symbol first so grouping is a single pass.
+# Prices are NUMERIC in the database; casting there returns plain doubles
+# instead of a Decimal per value.
+_OHLCV_ROWS_STMT = select(
+    Kline.id, Kline.symbol, Kline.open_time,
+    cast(Kline.open_price, Float), cast(Kline.high_price, Float),
+    cast(Kline.low_price, Float), cast(Kline.close_price, Float),
+    cast(Kline.volume, Float)
+).where(
+    and_(
+        Kline.symbol.in_(bindparam('symbols', expanding=True)),
+        Kline.open_time >= bindparam('start'),
+        Kline.open_time <= bindparam('end')
+    )
+).order_by(Kline.symbol, Kline.open_time)
+
+_latest_ranked = select(
+    Kline.symbol,
+    Kline.exchange,
+    cast(Kline.close_price, Float).label('close_price'),
+    Kline.open_time,
+    func.row_number().over(
+        partition_by=(Kline.symbol, Kline.exchange),
+        order_by=desc(Kline.open_time)
+    ).label('rn')
+).where(
+    and_(
+        Kline.symbol.in_(bindparam('symbols', expanding=True)),
+        Kline.exchange.in_(bindparam('exchanges', expanding=True)),
+        Kline.open_time >= bindparam('since')
+    )
+).subquery()
+_LATEST_PRICES_STMT = select(
+    _latest_ranked.c.symbol, _latest_ranked.c.exchange,
+    _latest_ranked.c.close_price, _latest_ranked.c.open_time
+).where(_latest_ranked.c.rn == 1)
+
+
+@dataclass(slots=True, frozen=True)
+class LeadLagConfig:
+    lead_symbol: str = 'BTCUSDT'
+    lag_symbol: str = 'ETHUSDT'
+    lookback_periods: int = 20
+    correlation_threshold: float = 0.7
+
+
+@dataclass(slots=True, frozen=True)
+class MomentumConfig:
+    symbols: Sequence[str] = ('BTCUSDT', 'ETHUSDT')
+    lookback_periods: int = 20
+    momentum_threshold: float = 0.02
+
+
+@dataclass(slots=True, frozen=True)
+class MeanReversionConfig:
+    symbols: Sequence[str] = ('BTCUSDT', 'ETHUSDT')
+    lookback_periods: int = 20
+    std_dev: float = 2
+
+
+@dataclass(slots=True, frozen=True)
+class BreakoutConfig:
+    symbols: Sequence[str] = ('BTCUSDT', 'ETHUSDT')
+    lookback_periods: int = 50
+    breakout_threshold: float = 0.01
+
+
+@dataclass(slots=True, frozen=True)
+class ArbitrageConfig:
+    symbols: Sequence[str] = ('BTCUSDT', 'ETHUSDT')
+    min_spread: float = 0.005  # 0.5% minimum spread
+
+
+@dataclass(slots=True, frozen=True)
+class CopyTradeConfig:
+    trader_addresses: Sequence[str] = ()
+    min_trade_size: float = 10000  # $10k minimum
+    copy_ratio: float = 0.1  # Copy 10% of their position
+
+
+STRATEGY_CONFIGS = {
+    StrategyType.LEAD_LAG: LeadLagConfig,
+    StrategyType.MOMENTUM: MomentumConfig,
+    StrategyType.MEAN_REVERSION: MeanReversionConfig,
+    StrategyType.BREAKOUT: BreakoutConfig,
+    StrategyType.ARBITRAGE: ArbitrageConfig,
+    StrategyType.COPY_TRADE: CopyTradeConfig,
+}
+
+
+def parse_strategy_config(config_cls: type, config: Optional[Dict[str, Any]]):
+    """Typed view of a strategy's JSON config; unknown keys are ignored, missing ones use defaults"""
+    config = config or {}
+    return config_cls(**{name: config[name] for name in config_cls.__slots__ if name in config})
+
+
+@dataclass(slots=True)
+class RollingStats:
+    """Count, sum and sum of squares of a sliding window"""
+    count: int = 0
+    sum: float = 0.0
+    sumsq: float = 0.0
+    
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "RollingStats":
+        return cls(len(values), float(values.sum()), float(np.dot(values, values)))
+    
+    def update(self, new: np.ndarray, old: np.ndarray):
+        """Add the values entering the window and remove the ones leaving it"""
+        self.count += len(new) - len(old)
+        self.sum += float(new.sum()) - float(old.sum())
+        self.sumsq += float(np.dot(new, new)) - float(np.dot(old, old))
+    
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+    
+    @property
+    def std(self) -> float:
+        """Population standard deviation, as np.std"""
+        if not self.count:
+            return 0.0
+        mean = self.sum / self.count
+        return math.sqrt(max(self.sumsq / self.count - mean * mean, 0.0))
+
+
+@dataclass(slots=True)
+class _KlineWindow:
+    """OHLCV rows of one symbol over a lookback window, in time order"""
+    ids: np.ndarray
+    times: np.ndarray  # datetime64[us]
+    data: np.ndarray  # one row per OHLCV_COLUMNS entry
+    close_stats: RollingStats
+    updates: int = 0
+    
+    @property
+    def bars(self) -> Dict[str, np.ndarray]:
+        return dict(zip(OHLCV_COLUMNS, self.data))
+    
+    @property
+    def last_time(self) -> datetime:
+        return self.times[-1].astype(datetime)
+    
+    def merge(self, ids: np.ndarray, times: np.ndarray, data: np.ndarray):
+        """Add fetched rows that are not in the window yet and refresh the ones that are.
+        
+        Ingestion upserts the open candle in place, so a re-read row can carry a
+        newer close/high/low/volume than the cached copy.
+        """
+        position = {row_id: index for index, row_id in enumerate(self.ids.tolist())}
+        slots = np.fromiter((position.get(row_id, -1) for row_id in ids.tolist()), dtype=np.int64, count=len(ids))
+        fresh = slots < 0
+        if not fresh.all():
+            known = slots[~fresh]
+            old_close = self.data[CLOSE, known].copy()
+            self.data[:, known] = data[:, ~fresh]
+            self.close_stats.update(self.data[CLOSE, known], old_close)
+        if not fresh.any():
+            return
+        ids, times, data = ids[fresh], times[fresh], data[:, fresh]
+        all_times = np.concatenate((self.times, times))
+        order = np.argsort(all_times, kind="stable")
+        self.ids = np.concatenate((self.ids, ids))[order]
+        self.times = all_times[order]
+        self.data = np.concatenate((self.data, data), axis=1)[:, order]
+        self.close_stats.update(data[CLOSE], _NO_VALUES)
+    
+    def expire(self, start_time: datetime):
+        """Drop rows older than start_time"""
+        cut = int(np.searchsorted(self.times, np.datetime64(start_time, "us")))
+        expired = self.data[CLOSE, :cut]
+        self.ids, self.times, self.data = self.ids[cut:], self.times[cut:], self.data[:, cut:]
+        self.updates += 1
+        if self.updates % ROLLING_STATS_RESYNC == 0:
+            self.close_stats = RollingStats.from_values(self.data[CLOSE])
+        else:
+            self.close_stats.update(_NO_VALUES, expired)
+
 
 class StrategyEngine:
     """Advanced strategy engine with multiple trading strategies"""
@@ -34,516 +285,569 @@ class StrategyEngine:
             StrategyType.COPY_TRADE: self._copy_trade_strategy
         }
         
-    async def generate_signals(self, strategy: Strategy) -> List[Dict]:
-        """Generate trading signals for a strategy"""
+        # Refreshed incrementally, so each run only reads klines written since the last one
+        self._kline_windows: "OrderedDict[Tuple[str, int], _KlineWindow]" = OrderedDict()
+        
+        # strategy id -> (type, raw config it was parsed from, parsed config)
+        self._config_cache: Dict[Any, Tuple[StrategyType, Any, Any]] = {}
+        
+    async def generate_signals(self, strategy: Strategy, session: Optional[AsyncSession] = None) -> List[Dict]:
+        """Generate trading signals for a strategy.
+        
+        All of the strategy's queries run on `session` when one is given; the
+        caller owns its transaction and must not use it from other tasks
+        concurrently. Without a session, one is opened for this call.
+        """
         try:
             strategy_func = self.strategies.get(strategy.strategy_type)
             if not strategy_func:
                 logger.warning(f"Unknown strategy type: {strategy.strategy_type}")
                 return []
                 
-            signals = await strategy_func(strategy)
-            return signals
+            config = self._strategy_config(strategy)
+            # One clock read per run, shared by every query window in it
+            now = datetime.utcnow()
+            if session is not None:
+                return await strategy_func(strategy, config, now, session)
+            async with get_async_session() as session:
+                return await strategy_func(strategy, config, now, session)
             
         except Exception as e:
             logger.error(f"Error generating signals for {strategy.name}: {e}")
             return []
             
-    async def _lead_lag_strategy(self, strategy: Strategy) -> List[Dict]:
+    def _strategy_config(self, strategy: Strategy):
+        """Parsed config for a strategy, reused until its type or config object changes"""
+        entry = self._config_cache.get(strategy.id)
+        # JSON columns are not mutation-tracked, so config edits replace the dict
+        # and an identity check is enough to notice them
+        if entry is not None and entry[0] == strategy.strategy_type and entry[1] is strategy.config:
+            return entry[2]
+        config = parse_strategy_config(STRATEGY_CONFIGS[strategy.strategy_type], strategy.config)
+        self._config_cache[strategy.id] = (strategy.strategy_type, strategy.config, config)
+        return config
+    
+    async def _fetch_ohlcv_rows(
+        self,
+        session: AsyncSession,
+        symbols: Sequence[str],
+        start_time: datetime,
+        end_time: datetime
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(ids, open times, OHLCV rows) for several symbols in one query, in time order"""
+        # Streamed from a server-side cursor, so only one batch of row objects
+        # exists at a time on cold loads of long lookbacks
+        result = await session.stream(
+            _OHLCV_ROWS_STMT, {'symbols': list(symbols), 'start': start_time, 'end': end_time}
+        )
+        id_parts, time_parts, data_parts = [], [], []
+        runs: List[List] = []  # [symbol, row count] in row order
+        async for rows in result.partitions(OHLCV_STREAM_BATCH):
+            id_parts.append(np.array([row[0] for row in rows], dtype=np.int64))
+            time_parts.append(np.array([row[2] for row in rows], dtype="datetime64[us]"))
+            data_parts.append(np.array([row[3:] for row in rows], dtype=np.float64))
+            for symbol, group in groupby(rows, key=itemgetter(1)):
+                count = sum(1 for _ in group)
+                # A symbol's rows can continue from the previous batch
+                if runs and runs[-1][0] == symbol:
+                    runs[-1][1] += count
+                else:
+                    runs.append([symbol, count])
+        if not runs:
+            return {}
+        
+        # One allocation per column type for every symbol; each OHLCV row is contiguous
+        ids = np.concatenate(id_parts)
+        times = np.concatenate(time_parts)
+        data = np.concatenate(data_parts).T.copy()
+        fetched = {}
+        start = 0
+        for symbol, count in runs:
+            end = start + count
+            fetched[symbol] = (ids[start:end], times[start:end], data[:, start:end])
+            start = end
+        return fetched
+    
+    async def _ohlcv_windows(
+        self,
+        session: AsyncSession,
+        symbols: Sequence[str],
+        lookback_hours: int,
+        end_time: datetime
+    ) -> Dict[str, _KlineWindow]:
+        """Kline windows covering the last lookback_hours for each symbol that has data"""
+        start_time = end_time - timedelta(hours=lookback_hours)
+        
+        cached: Dict[str, _KlineWindow] = {}
+        missing: List[str] = []
+        for symbol in dict.fromkeys(symbols):
+            window = self._kline_windows.get((symbol, lookback_hours))
+            # A window that ended before start_time shares no rows with the new one
+            if window is not None and window.last_time >= start_time:
+                cached[symbol] = window
+            else:
+                missing.append(symbol)
+        
+        fetched: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        if missing:
+            fetched.update(await self._fetch_ohlcv_rows(session, missing, start_time, end_time))
+        if cached:
+            since = min(window.last_time for window in cached.values()) - KLINE_LATE_ARRIVAL
+            fetched.update(await self._fetch_ohlcv_rows(session, list(cached), max(since, start_time), end_time))
+        
+        windows: Dict[str, _KlineWindow] = {}
+        for symbol in missing + list(cached):
+            key = (symbol, lookback_hours)
+            window = cached.get(symbol)
+            rows = fetched.get(symbol)
+            if window is None:
+                if rows is None:
+                    self._kline_windows.pop(key, None)
+                    continue
+                window = _KlineWindow(*rows, close_stats=RollingStats.from_values(rows[2][CLOSE]))
+            else:
+                if rows is not None:
+                    window.merge(*rows)
+                window.expire(start_time)
+                if not len(window.ids):
+                    self._kline_windows.pop(key, None)
+                    continue
+            
+            self._kline_windows[key] = window
+            self._kline_windows.move_to_end(key)
+            windows[symbol] = window
+        
+        while len(self._kline_windows) > KLINE_WINDOW_CACHE_SIZE:
+            self._kline_windows.popitem(last=False)
+        return windows
+            
+    async def _latest_prices(
+        self,
+        session: AsyncSession,
+        symbols: Sequence[str],
+        exchanges: Sequence[str],
+        since: datetime
+    ) -> Dict[Tuple[str, str], Tuple[float, datetime]]:
+        """(close price, open time) of the newest kline since `since` per (symbol, exchange)"""
+        result = await session.execute(
+            _LATEST_PRICES_STMT, {'symbols': list(symbols), 'exchanges': list(exchanges), 'since': since}
+        )
+        return {
+            (symbol, exchange): (price, open_time)
+            for symbol, exchange, price, open_time in result.all()
+        }
+            
+    async def _lead_lag_strategy(self, strategy: Strategy, config: LeadLagConfig, now: datetime, session: AsyncSession) -> List[Dict]:
         """Lead-lag momentum strategy"""
         try:
             signals = []
             
             # Get market data for lead and lag symbols
-            config = strategy.config
-            lead_symbol = config.get('lead_symbol', 'BTCUSDT')
-            lag_symbol = config.get('lag_symbol', 'ETHUSDT')
-            lookback_periods = config.get('lookback_periods', 20)
-            correlation_threshold = config.get('correlation_threshold', 0.7)
-            
-            async with get_async_session() as session:
-                # Get recent klines for both symbols
-                end_time = datetime.utcnow()
-                start_time = end_time - timedelta(hours=lookback_periods)
+            lead_symbol = config.lead_symbol
+            lag_symbol = config.lag_symbol
+            lookback_periods = config.lookback_periods
+            correlation_threshold = config.correlation_threshold
+            
+            # Get recent klines for both symbols
+            windows = await self._ohlcv_windows(
+                session, [lead_symbol, lag_symbol], lookback_periods, now
+            )
+            if lead_symbol not in windows or lag_symbol not in windows:
+                return signals
+            lead_bars = windows[lead_symbol].bars
+            lag_bars = windows[lag_symbol].bars
+            
+            if len(lead_bars["close"]) < lookback_periods or len(lag_bars["close"]) < lookback_periods:
+                return signals
                 
-                # Lead symbol data
-                lead_result = await session.execute(
-                    select(Kline).where(
-                        and_(
-                            Kline.symbol == lead_symbol,
-                            Kline.timestamp >= start_time,
-                            Kline.timestamp <= end_time
-                        )
-                    ).order_by(Kline.timestamp)
-                )
-                lead_klines = lead_result.scalars().all()
+            # Calculate returns
+            lead_returns = lead_bars["close"][-lookback_periods:] / lead_bars["open"][-lookback_periods:] - 1
+            lag_returns = lag_bars["close"][-lookback_periods:] / lag_bars["open"][-lookback_periods:] - 1
+            
+            # Correlation and momentum over the last 5 periods
+            correlation, lead_momentum, lag_momentum = self._corr_and_tail_means(lead_returns, lag_returns, 5)
+            
+            if abs(correlation) < correlation_threshold:
+                return signals
+            
+            # Generate signal
+            if lead_momentum > 0.01 and lag_momentum < 0.005:  # Lead up, lag flat
+                confidence = min(abs(correlation) * abs(lead_momentum) * 10, 1.0)
+                signals.append({
+                    'symbol': lag_symbol,
+                    'exchange': 'binance',
+                    'action': 'buy',
+                    'confidence': confidence,
+                    'risk_score': 70,
+                    'price': float(lag_bars["close"][-1]),
+                    'strategy': 'lead_lag',
+                    'metadata': {
+                        'lead_symbol': lead_symbol,
+                        'correlation': correlation,
+                        'lead_momentum': lead_momentum,
+                        'lag_momentum': lag_momentum
+                    }
+                })
+            elif lead_momentum < -0.01 and lag_momentum > -0.005:  # Lead down, lag flat
+                confidence = min(abs(correlation) * abs(lead_momentum) * 10, 1.0)
+                signals.append({
+                    'symbol': lag_symbol,
+                    'exchange': 'binance',
+                    'action': 'sell',
+                    'confidence': confidence,
+                    'risk_score': 70,
+                    'price': float(lag_bars["close"][-1]),
+                    'strategy': 'lead_lag',
+                    'metadata': {
+                        'lead_symbol': lead_symbol,
+                        'correlation': correlation,
+                        'lead_momentum': lead_momentum,
+                        'lag_momentum': lag_momentum
+                    }
+                })
                 
-                # Lag symbol data
-                lag_result = await session.execute(
-                    select(Kline).where(
-                        and_(
-                            Kline.symbol == lag_symbol,
-                            Kline.timestamp >= start_time,
-                            Kline.timestamp <= end_time
-                        )
-                    ).order_by(Kline.timestamp)
-                )
-                lag_klines = lag_result.scalars().all()
+            return signals
+            
+        except Exception as e:
+            logger.error(f"Error in lead-lag strategy: {e}")
+            return []
+            
+    async def _momentum_strategy(self, strategy: Strategy, config: MomentumConfig, now: datetime, session: AsyncSession) -> List[Dict]:
+        """Momentum strategy based on price and volume"""
+        try:
+            signals = []
+            
+            symbols = config.symbols
+            lookback_periods = config.lookback_periods
+            momentum_threshold = config.momentum_threshold
+            
+            # Get recent klines for every symbol at once
+            windows = await self._ohlcv_windows(session, symbols, lookback_periods, now)
+            
+            for symbol in symbols:
+                window = windows.get(symbol)
                 
-                if len(lead_klines) < lookback_periods or len(lag_klines) < lookback_periods:
-                    return signals
+                if window is None or len(window.ids) < lookback_periods:
+                    continue
+                bars = window.bars
                     
-                # Calculate returns
-                lead_returns = [float(k.close_price) / float(k.open_price) - 1 for k in lead_klines[-lookback_periods:]]
-                lag_returns = [float(k.close_price) / float(k.open_price) - 1 for k in lag_klines[-lookback_periods:]]
+                # Calculate momentum indicators
+                prices = bars["close"]
+                volumes = bars["volume"]
                 
-                # Calculate correlation
-                correlation = np.corrcoef(lead_returns, lag_returns)[0, 1]
+                # Price momentum, and recent (last 5) vs average volume
+                price_momentum, volume_momentum = _momentum_kernel(
+                    *self._kernel_args(prices, volumes), lookback_periods, 5
+                )
                 
-                if abs(correlation) < correlation_threshold:
-                    return signals
-                    
-                # Calculate momentum
-                lead_momentum = np.mean(lead_returns[-5:])  # Last 5 periods
-                lag_momentum = np.mean(lag_returns[-5:])
+                # RSI
+                rsi = self._calculate_rsi(prices, 14)
                 
-                # Generate signal
-                if lead_momentum > 0.01 and lag_momentum < 0.005:  # Lead up, lag flat
-                    confidence = min(abs(correlation) * abs(lead_momentum) * 10, 1.0)
+                # Generate signals
+                if (price_momentum > momentum_threshold and 
+                    volume_momentum > 0.2 and 
+                    rsi < 70):  # Not overbought
+                    
+                    confidence = min(abs(price_momentum) * 5 + min(volume_momentum, 1) * 0.3, 1.0)
                     signals.append({
-                        'symbol': lag_symbol,
+                        'symbol': symbol,
                         'exchange': 'binance',
                         'action': 'buy',
                         'confidence': confidence,
-                        'risk_score': 70,
-                        'price': float(lag_klines[-1].close_price),
-                        'strategy': 'lead_lag',
+                        'risk_score': 60,
+                        'price': float(prices[-1]),
+                        'strategy': 'momentum',
                         'metadata': {
-                            'lead_symbol': lead_symbol,
-                            'correlation': correlation,
-                            'lead_momentum': lead_momentum,
-                            'lag_momentum': lag_momentum
+                            'price_momentum': price_momentum,
+                            'volume_momentum': volume_momentum,
+                            'rsi': rsi
                         }
                     })
-                elif lead_momentum < -0.01 and lag_momentum > -0.005:  # Lead down, lag flat
-                    confidence = min(abs(correlation) * abs(lead_momentum) * 10, 1.0)
+                    
+                elif (price_momentum < -momentum_threshold and 
+                      volume_momentum > 0.2 and 
+                      rsi > 30):  # Not oversold
+                    
+                    confidence = min(abs(price_momentum) * 5 + min(volume_momentum, 1) * 0.3, 1.0)
                     signals.append({
-                        'symbol': lag_symbol,
+                        'symbol': symbol,
                         'exchange': 'binance',
                         'action': 'sell',
                         'confidence': confidence,
-                        'risk_score': 70,
-                        'price': float(lag_klines[-1].close_price),
-                        'strategy': 'lead_lag',
+                        'risk_score': 60,
+                        'price': float(prices[-1]),
+                        'strategy': 'momentum',
                         'metadata': {
-                            'lead_symbol': lead_symbol,
-                            'correlation': correlation,
-                            'lead_momentum': lead_momentum,
-                            'lag_momentum': lag_momentum
+                            'price_momentum': price_momentum,
+                            'volume_momentum': volume_momentum,
+                            'rsi': rsi
                         }
                     })
                     
             return signals
             
-        except Exception as e:
-            logger.error(f"Error in lead-lag strategy: {e}")
-            return []
-            
-    async def _momentum_strategy(self, strategy: Strategy) -> List[Dict]:
-        """Momentum strategy based on price and volume"""
-        try:
-            signals = []
-            
-            config = strategy.config
-            symbols = config.get('symbols', ['BTCUSDT', 'ETHUSDT'])
-            lookback_periods = config.get('lookback_periods', 20)
-            momentum_threshold = config.get('momentum_threshold', 0.02)
-            
-            async with get_async_session() as session:
-                for symbol in symbols:
-                    # Get recent klines
-                    end_time = datetime.utcnow()
-                    start_time = end_time - timedelta(hours=lookback_periods)
-                    
-                    result = await session.execute(
-                        select(Kline).where(
-                            and_(
-                                Kline.symbol == symbol,
-                                Kline.timestamp >= start_time,
-                                Kline.timestamp <= end_time
-                            )
-                        ).order_by(Kline.timestamp)
-                    )
-                    klines = result.scalars().all()
-                    
-                    if len(klines) < lookback_periods:
-                        continue
-                        
-                    # Calculate momentum indicators
-                    prices = [float(k.close_price) for k in klines]
-                    volumes = [float(k.volume) for k in klines]
-                    
-                    # Price momentum
-                    price_momentum = (prices[-1] - prices[-lookback_periods]) / prices[-lookback_periods]
-                    
-                    # Volume momentum
-                    avg_volume = np.mean(volumes[-lookback_periods:])
-                    recent_volume = np.mean(volumes[-5:])
-                    volume_momentum = (recent_volume - avg_volume) / avg_volume
-                    
-                    # RSI
-                    rsi = self._calculate_rsi(prices, 14)
-                    
-                    # Generate signals
-                    if (price_momentum > momentum_threshold and 
-                        volume_momentum > 0.2 and 
-                        rsi < 70):  # Not overbought
-                        
-                        confidence = min(abs(price_momentum) * 5 + min(volume_momentum, 1) * 0.3, 1.0)
-                        signals.append({
-                            'symbol': symbol,
-                            'exchange': 'binance',
-                            'action': 'buy',
-                            'confidence': confidence,
-                            'risk_score': 60,
-                            'price': prices[-1],
-                            'strategy': 'momentum',
-                            'metadata': {
-                                'price_momentum': price_momentum,
-                                'volume_momentum': volume_momentum,
-                                'rsi': rsi
-                            }
-                        })
-                        
-                    elif (price_momentum < -momentum_threshold and 
-                          volume_momentum > 0.2 and 
-                          rsi > 30):  # Not oversold
-                        
-                        confidence = min(abs(price_momentum) * 5 + min(volume_momentum, 1) * 0.3, 1.0)
-                        signals.append({
-                            'symbol': symbol,
-                            'exchange': 'binance',
-                            'action': 'sell',
-                            'confidence': confidence,
-                            'risk_score': 60,
-                            'price': prices[-1],
-                            'strategy': 'momentum',
-                            'metadata': {
-                                'price_momentum': price_momentum,
-                                'volume_momentum': volume_momentum,
-                                'rsi': rsi
-                            }
-                        })
-                        
-            return signals
-            
         except Exception as e:
             logger.error(f"Error in momentum strategy: {e}")
             return []
             
-    async def _mean_reversion_strategy(self, strategy: Strategy) -> List[Dict]:
+    async def _mean_reversion_strategy(self, strategy: Strategy, config: MeanReversionConfig, now: datetime, session: AsyncSession) -> List[Dict]:
         """Mean reversion strategy based on Bollinger Bands"""
         try:
             signals = []
             
-            config = strategy.config
-            symbols = config.get('symbols', ['BTCUSDT', 'ETHUSDT'])
-            lookback_periods = config.get('lookback_periods', 20)
-            std_dev = config.get('std_dev', 2)
+            symbols = config.symbols
+            lookback_periods = config.lookback_periods
+            std_dev = config.std_dev
             
-            async with get_async_session() as session:
-                for symbol in symbols:
-                    # Get recent klines
-                    end_time = datetime.utcnow()
-                    start_time = end_time - timedelta(hours=lookback_periods)
-                    
-                    result = await session.execute(
-                        select(Kline).where(
-                            and_(
-                                Kline.symbol == symbol,
-                                Kline.timestamp >= start_time,
-                                Kline.timestamp <= end_time
-                            )
-                        ).order_by(Kline.timestamp)
-                    )
-                    klines = result.scalars().all()
-                    
-                    if len(klines) < lookback_periods:
-                        continue
-                        
-                    # Calculate Bollinger Bands
-                    prices = [float(k.close_price) for k in klines]
-                    sma = np.mean(prices)
-                    price_std = np.std(prices)
+            # Get recent klines for every symbol at once
+            windows = await self._ohlcv_windows(session, symbols, lookback_periods, now)
+            
+            for symbol in symbols:
+                window = windows.get(symbol)
+                
+                if window is None or len(window.ids) < lookback_periods:
+                    continue
+                bars = window.bars
                     
-                    upper_band = sma + (std_dev * price_std)
-                    lower_band = sma - (std_dev * price_std)
+                # Calculate Bollinger Bands
+                prices = bars["close"]
+                sma = window.close_stats.mean
+                price_std = window.close_stats.std
+                
+                upper_band = sma + (std_dev * price_std)
+                lower_band = sma - (std_dev * price_std)
+                
+                current_price = float(prices[-1])
+                
+                # Generate signals
+                if current_price <= lower_band:  # Oversold
+                    confidence = min((lower_band - current_price) / price_std * 0.5, 1.0)
+                    signals.append({
+                        'symbol': symbol,
+                        'exchange': 'binance',
+                        'action': 'buy',
+                        'confidence': confidence,
+                        'risk_score': 50,
+                        'price': current_price,
+                        'strategy': 'mean_reversion',
+                        'metadata': {
+                            'sma': sma,
+                            'upper_band': upper_band,
+                            'lower_band': lower_band,
+                            'current_price': current_price,
+                            'deviation': (current_price - sma) / price_std
+                        }
+                    })
                     
-                    current_price = prices[-1]
+                elif current_price >= upper_band:  # Overbought
+                    confidence = min((current_price - upper_band) / price_std * 0.5, 1.0)
+                    signals.append({
+                        'symbol': symbol,
+                        'exchange': 'binance',
+                        'action': 'sell',
+                        'confidence': confidence,
+                        'risk_score': 50,
+                        'price': current_price,
+                        'strategy': 'mean_reversion',
+                        'metadata': {
+                            'sma': sma,
+                            'upper_band': upper_band,
+                            'lower_band': lower_band,
+                            'current_price': current_price,
+                            'deviation': (current_price - sma) / price_std
+                        }
+                    })
                     
-                    # Generate signals
-                    if current_price <= lower_band:  # Oversold
-                        confidence = min((lower_band - current_price) / price_std * 0.5, 1.0)
-                        signals.append({
-                            'symbol': symbol,
-                            'exchange': 'binance',
-                            'action': 'buy',
-                            'confidence': confidence,
-                            'risk_score': 50,
-                            'price': current_price,
-                            'strategy': 'mean_reversion',
-                            'metadata': {
-                                'sma': sma,
-                                'upper_band': upper_band,
-                                'lower_band': lower_band,
-                                'current_price': current_price,
-                                'deviation': (current_price - sma) / price_std
-                            }
-                        })
-                        
-                    elif current_price >= upper_band:  # Overbought
-                        confidence = min((current_price - upper_band) / price_std * 0.5, 1.0)
-                        signals.append({
-                            'symbol': symbol,
-                            'exchange': 'binance',
-                            'action': 'sell',
-                            'confidence': confidence,
-                            'risk_score': 50,
-                            'price': current_price,
-                            'strategy': 'mean_reversion',
-                            'metadata': {
-                                'sma': sma,
-                                'upper_band': upper_band,
-                                'lower_band': lower_band,
-                                'current_price': current_price,
-                                'deviation': (current_price - sma) / price_std
-                            }
-                        })
-                        
             return signals
             
         except Exception as e:
             logger.error(f"Error in mean reversion strategy: {e}")
             return []
             
-    async def _breakout_strategy(self, strategy: Strategy) -> List[Dict]:
+    async def _breakout_strategy(self, strategy: Strategy, config: BreakoutConfig, now: datetime, session: AsyncSession) -> List[Dict]:
         """Breakout strategy based on support/resistance levels"""
         try:
             signals = []
             
-            config = strategy.config
-            symbols = config.get('symbols', ['BTCUSDT', 'ETHUSDT'])
-            lookback_periods = config.get('lookback_periods', 50)
-            breakout_threshold = config.get('breakout_threshold', 0.01)
+            symbols = config.symbols
+            lookback_periods = config.lookback_periods
+            breakout_threshold = config.breakout_threshold
             
-            async with get_async_session() as session:
-                for symbol in symbols:
-                    # Get recent klines
-                    end_time = datetime.utcnow()
-                    start_time = end_time - timedelta(hours=lookback_periods)
-                    
-                    result = await session.execute(
-                        select(Kline).where(
-                            and_(
-                                Kline.symbol == symbol,
-                                Kline.timestamp >= start_time,
-                                Kline.timestamp <= end_time
-                            )
-                        ).order_by(Kline.timestamp)
-                    )
-                    klines = result.scalars().all()
+            # Get recent klines for every symbol at once
+            windows = await self._ohlcv_windows(session, symbols, lookback_periods, now)
+            
+            for symbol in symbols:
+                window = windows.get(symbol)
+                
+                if window is None or len(window.ids) < lookback_periods:
+                    continue
+                bars = window.bars
                     
-                    if len(klines) < lookback_periods:
-                        continue
-                        
-                    # Calculate support and resistance levels
-                    highs = [float(k.high_price) for k in klines]
-                    lows = [float(k.low_price) for k in klines]
-                    closes = [float(k.close_price) for k in klines]
+                # Calculate support and resistance levels
+                highs = bars["high"]
+                lows = bars["low"]
+                closes = bars["close"]
+                
+                # Find recent highs and lows
+                recent_high = float(highs[-20:].max())
+                recent_low = float(lows[-20:].min())
+                current_price = float(closes[-1])
+                
+                # Check for breakouts
+                if current_price > recent_high * (1 + breakout_threshold):
+                    # Bullish breakout
+                    confidence = min((current_price - recent_high) / recent_high * 10, 1.0)
+                    signals.append({
+                        'symbol': symbol,
+                        'exchange': 'binance',
+                        'action': 'buy',
+                        'confidence': confidence,
+                        'risk_score': 80,
+                        'price': current_price,
+                        'strategy': 'breakout',
+                        'metadata': {
+                            'resistance_level': recent_high,
+                            'current_price': current_price,
+                            'breakout_percentage': (current_price - recent_high) / recent_high * 100
+                        }
+                    })
                     
-                    # Find recent highs and lows
-                    recent_high = max(highs[-20:])
-                    recent_low = min(lows[-20:])
-                    current_price = closes[-1]
+                elif current_price < recent_low * (1 - breakout_threshold):
+                    # Bearish breakout
+                    confidence = min((recent_low - current_price) / recent_low * 10, 1.0)
+                    signals.append({
+                        'symbol': symbol,
+                        'exchange': 'binance',
+                        'action': 'sell',
+                        'confidence': confidence,
+                        'risk_score': 80,
+                        'price': current_price,
+                        'strategy': 'breakout',
+                        'metadata': {
+                            'support_level': recent_low,
+                            'current_price': current_price,
+                            'breakout_percentage': (recent_low - current_price) / recent_low * 100
+                        }
+                    })
                     
-                    # Check for breakouts
-                    if current_price > recent_high * (1 + breakout_threshold):
-                        # Bullish breakout
-                        confidence = min((current_price - recent_high) / recent_high * 10, 1.0)
-                        signals.append({
-                            'symbol': symbol,
-                            'exchange': 'binance',
-                            'action': 'buy',
-                            'confidence': confidence,
-                            'risk_score': 80,
-                            'price': current_price,
-                            'strategy': 'breakout',
-                            'metadata': {
-                                'resistance_level': recent_high,
-                                'current_price': current_price,
-                                'breakout_percentage': (current_price - recent_high) / recent_high * 100
-                            }
-                        })
-                        
-                    elif current_price < recent_low * (1 - breakout_threshold):
-                        # Bearish breakout
-                        confidence = min((recent_low - current_price) / recent_low * 10, 1.0)
-                        signals.append({
-                            'symbol': symbol,
-                            'exchange': 'binance',
-                            'action': 'sell',
-                            'confidence': confidence,
-                            'risk_score': 80,
-                            'price': current_price,
-                            'strategy': 'breakout',
-                            'metadata': {
-                                'support_level': recent_low,
-                                'current_price': current_price,
-                                'breakout_percentage': (recent_low - current_price) / recent_low * 100
-                            }
-                        })
-                        
             return signals
             
         except Exception as e:
             logger.error(f"Error in breakout strategy: {e}")
             return []
             
-    async def _arbitrage_strategy(self, strategy: Strategy) -> List[Dict]:
+    async def _arbitrage_strategy(self, strategy: Strategy, config: ArbitrageConfig, now: datetime, session: AsyncSession) -> List[Dict]:
         """Arbitrage strategy between exchanges"""
         try:
             signals = []
             
-            config = strategy.config
-            symbols = config.get('symbols', ['BTCUSDT', 'ETHUSDT'])
-            min_spread = config.get('min_spread', 0.005)  # 0.5% minimum spread
+            symbols = config.symbols
+            min_spread = config.min_spread
             
-            async with get_async_session() as session:
-                for symbol in symbols:
-                    # Get latest prices from different exchanges
-                    end_time = datetime.utcnow()
-                    start_time = end_time - timedelta(minutes=5)
-                    
-                    # Binance price
-                    binance_result = await session.execute(
-                        select(Kline).where(
-                            and_(
-                                Kline.symbol == symbol,
-                                Kline.exchange == 'binance',
-                                Kline.timestamp >= start_time
-                            )
-                        ).order_by(desc(Kline.timestamp)).limit(1)
-                    )
-                    binance_kline = binance_result.scalar_one_or_none()
-                    
-                    # Bybit price
-                    bybit_result = await session.execute(
-                        select(Kline).where(
-                            and_(
-                                Kline.symbol == symbol,
-                                Kline.exchange == 'bybit',
-                                Kline.timestamp >= start_time
-                            )
-                        ).order_by(desc(Kline.timestamp)).limit(1)
-                    )
-                    bybit_kline = bybit_result.scalar_one_or_none()
-                    
-                    if not binance_kline or not bybit_kline:
-                        continue
-                        
-                    binance_price = float(binance_kline.close_price)
-                    bybit_price = float(bybit_kline.close_price)
-                    
-                    # Calculate spread
-                    spread = abs(binance_price - bybit_price) / min(binance_price, bybit_price)
+            start_time = now - timedelta(minutes=5)
+            
+            # Latest prices from both exchanges for every symbol at once
+            latest = await self._latest_prices(session, symbols, ('binance', 'bybit'), start_time)
+            
+            for symbol in symbols:
+                binance = latest.get((symbol, 'binance'))
+                bybit = latest.get((symbol, 'bybit'))
+                
+                if not binance or not bybit:
+                    continue
                     
-                    if spread > min_spread:
-                        if binance_price > bybit_price:
-                            # Buy on Bybit, sell on Binance
-                            confidence = min(spread * 20, 1.0)
-                            signals.extend([
-                                {
-                                    'symbol': symbol,
-                                    'exchange': 'bybit',
-                                    'action': 'buy',
-                                    'confidence': confidence,
-                                    'risk_score': 90,
-                                    'price': bybit_price,
-                                    'strategy': 'arbitrage',
-                                    'metadata': {
-                                        'binance_price': binance_price,
-                                        'bybit_price': bybit_price,
-                                        'spread': spread,
-                                        'arbitrage_type': 'buy_bybit_sell_binance'
-                                    }
-                                },
-                                {
-                                    'symbol': symbol,
-                                    'exchange': 'binance',
-                                    'action': 'sell',
-                                    'confidence': confidence,
-                                    'risk_score': 90,
-                                    'price': binance_price,
-                                    'strategy': 'arbitrage',
-                                    'metadata': {
-                                        'binance_price': binance_price,
-                                        'bybit_price': bybit_price,
-                                        'spread': spread,
-                                        'arbitrage_type': 'buy_bybit_sell_binance'
-                                    }
+                binance_price = binance[0]
+                bybit_price = bybit[0]
+                
+                # Calculate spread
+                spread = abs(binance_price - bybit_price) / min(binance_price, bybit_price)
+                
+                if spread > min_spread:
+                    if binance_price > bybit_price:
+                        # Buy on Bybit, sell on Binance
+                        confidence = min(spread * 20, 1.0)
+                        signals.extend([
+                            {
+                                'symbol': symbol,
+                                'exchange': 'bybit',
+                                'action': 'buy',
+                                'confidence': confidence,
+                                'risk_score': 90,
+                                'price': bybit_price,
+                                'strategy': 'arbitrage',
+                                'metadata': {
+                                    'binance_price': binance_price,
+                                    'bybit_price': bybit_price,
+                                    'spread': spread,
+                                    'arbitrage_type': 'buy_bybit_sell_binance'
+                                }
+                            },
+                            {
+                                'symbol': symbol,
+                                'exchange': 'binance',
+                                'action': 'sell',
+                                'confidence': confidence,
+                                'risk_score': 90,
+                                'price': binance_price,
+                                'strategy': 'arbitrage',
+                                'metadata': {
+                                    'binance_price': binance_price,
+                                    'bybit_price': bybit_price,
+                                    'spread': spread,
+                                    'arbitrage_type': 'buy_bybit_sell_binance'
                                 }
-                            ])
-                        else:
-                            # Buy on Binance, sell on Bybit
-                            confidence = min(spread * 20, 1.0)
-                            signals.extend([
-                                {
-                                    'symbol': symbol,
-                                    'exchange': 'binance',
-                                    'action': 'buy',
-                                    'confidence': confidence,
-                                    'risk_score': 90,
-                                    'price': binance_price,
-                                    'strategy': 'arbitrage',
-                                    'metadata': {
-                                        'binance_price': binance_price,
-                                        'bybit_price': bybit_price,
-                                        'spread': spread,
-                                        'arbitrage_type': 'buy_binance_sell_bybit'
-                                    }
-                                },
-                                {
-                                    'symbol': symbol,
-                                    'exchange': 'bybit',
-                                    'action': 'sell',
-                                    'confidence': confidence,
-                                    'risk_score': 90,
-                                    'price': bybit_price,
-                                    'strategy': 'arbitrage',
-                                    'metadata': {
-                                        'binance_price': binance_price,
-                                        'bybit_price': bybit_price,
-                                        'spread': spread,
-                                        'arbitrage_type': 'buy_binance_sell_bybit'
-                                    }
+                            }
+                        ])
+                    else:
+                        # Buy on Binance, sell on Bybit
+                        confidence = min(spread * 20, 1.0)
+                        signals.extend([
+                            {
+                                'symbol': symbol,
+                                'exchange': 'binance',
+                                'action': 'buy',
+                                'confidence': confidence,
+                                'risk_score': 90,
+                                'price': binance_price,
+                                'strategy': 'arbitrage',
+                                'metadata': {
+                                    'binance_price': binance_price,
+                                    'bybit_price': bybit_price,
+                                    'spread': spread,
+                                    'arbitrage_type': 'buy_binance_sell_bybit'
                                 }
-                            ])
-                            
+                            },
+                            {
+                                'symbol': symbol,
+                                'exchange': 'bybit',
+                                'action': 'sell',
+                                'confidence': confidence,
+                                'risk_score': 90,
+                                'price': bybit_price,
+                                'strategy': 'arbitrage',
+                                'metadata': {
+                                    'binance_price': binance_price,
+                                    'bybit_price': bybit_price,
+                                    'spread': spread,
+                                    'arbitrage_type': 'buy_binance_sell_bybit'
+                                }
+                            }
+                        ])
+                        
             return signals
             
         except Exception as e:
             logger.error(f"Error in arbitrage strategy: {e}")
             return []
             
-    async def _copy_trade_strategy(self, strategy: Strategy) -> List[Dict]:
+    async def _copy_trade_strategy(self, strategy: Strategy, config: CopyTradeConfig, now: datetime, session: AsyncSession) -> List[Dict]:
         """Copy trading strategy based on whale movements"""
         try:
             signals = []
             
-            config = strategy.config
-            trader_addresses = config.get('trader_addresses', [])
-            min_trade_size = config.get('min_trade_size', 10000)  # $10k minimum
-            copy_ratio = config.get('copy_ratio', 0.1)  # Copy 10% of their position
+            trader_addresses = config.trader_addresses
+            min_trade_size = config.min_trade_size
+            copy_ratio = config.copy_ratio
             
             # This would integrate with blockchain data or exchange APIs
             # to track large trades and copy them
@@ -555,26 +859,30 @@ class StrategyEngine:
             logger.error(f"Error in copy trade strategy: {e}")
             return []
             
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
+    def _corr_and_tail_means(self, a: np.ndarray, b: np.ndarray, tail: int) -> Tuple[float, float, float]:
+        """Pearson correlation of a and b, and the means of their last `tail` values"""
+        ca = a - a.mean()
+        cb = b - b.mean()
+        denom = math.sqrt(float(ca @ ca) * float(cb @ cb))
+        # Like np.corrcoef, a constant series has an undefined (nan) correlation
+        correlation = float(ca @ cb) / denom if denom else math.nan
+        return correlation, float(a[-tail:].mean()), float(b[-tail:].mean())
+            
+    def _kernel_args(self, *arrays: np.ndarray) -> tuple:
+        """Kernel inputs: the arrays under numba, plain lists (faster to index) without it"""
+        if njit is not None:
+            return arrays
+        return tuple(a.tolist() for a in arrays)
+            
+    def _calculate_rsi(self, prices: np.ndarray, period: int = 14) -> float:
         """Calculate RSI indicator"""
         try:
             if len(prices) < period + 1:
                 return 50.0
                 
-            deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-            gains = [d if d > 0 else 0 for d in deltas]
-            losses = [-d if d < 0 else 0 for d in deltas]
-            
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = np.mean(losses[-period:])
-            
-            if avg_loss == 0:
-                return 100.0
-                
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi
+            # Only the last `period` deltas are used
+            tail = np.asarray(prices[-(period + 1):], dtype=np.float64)
+            return _rsi_kernel(*self._kernel_args(tail), period)
             
         except Exception as e:
             logger.error(f"Error calculating RSI: {e}")
@@ -4,6 +4,7 @@ Advanced Trading Engine with Risk Management and Strategy Execution
 
 import asyncio
 import json
+import random
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
@@ -23,6 +24,12 @@ from services.strategy_engine import StrategyEngine
 
 logger = structlog.get_logger()
 
+# Drives the simulated price moves in _update_position_price
+_price_rng = random.Random()
+
+# Strategies generating signals at once; each holds a database connection
+SIGNAL_GENERATION_CONCURRENCY = 8
+
 
 class TradingEngine:
     """Advanced trading engine with risk management and strategy execution"""
@@ -32,6 +39,7 @@ class TradingEngine:
         self.strategy_engine = StrategyEngine()
         self.active_strategies: Dict[int, Strategy] = {}
         self.running = False
+        self._signal_semaphore = asyncio.Semaphore(SIGNAL_GENERATION_CONCURRENCY)
         
     async def start(self):
         """Start the trading engine"""
@@ -73,8 +81,15 @@ class TradingEngine:
         """Main strategy execution loop"""
         while self.running:
             try:
-                for strategy_id, strategy in self.active_strategies.items():
-                    await self._execute_strategy(strategy)
+                # Signal generation only reads market data, so strategies overlap their
+                # queries; orders are still placed one strategy at a time so each risk
+                # check sees the orders placed before it
+                strategies = list(self.active_strategies.values())
+                all_signals = await asyncio.gather(
+                    *(self._generate_signals(strategy) for strategy in strategies)
+                )
+                for strategy, signals in zip(strategies, all_signals):
+                    await self._execute_strategy(strategy, signals)
                     
                 await asyncio.sleep(1)  # Execute every second
                 
@@ -105,12 +120,14 @@ class TradingEngine:
                 logger.error(f"Error in position monitoring loop: {e}")
                 await asyncio.sleep(30)
                 
-    async def _execute_strategy(self, strategy: Strategy):
-        """Execute a single strategy"""
+    async def _generate_signals(self, strategy: Strategy) -> List[Dict]:
+        """Generate a strategy's signals, bounded by SIGNAL_GENERATION_CONCURRENCY"""
+        async with self._signal_semaphore:
+            return await self.strategy_engine.generate_signals(strategy)
+                
+    async def _execute_strategy(self, strategy: Strategy, signals: List[Dict]):
+        """Execute a single strategy's signals"""
         try:
-            # Get market data and generate signals
-            signals = await self.strategy_engine.generate_signals(strategy)
-            
             for signal in signals:
                 # Check risk limits before placing order
                 if await self.risk_manager.check_order_risk(signal, strategy):
@@ -301,9 +318,8 @@ class TradingEngine:
         """Update position current price and PnL"""
         # This would integrate with real-time market data
         # For now, simulate small price movements
-        import random
-        price_change = random.uniform(-0.02, 0.02)  # ±2% price change
-        new_price = position.current_price * (1 + Decimal(str(price_change)))
+        price_change = Decimal(_price_rng.randint(-200, 200)).scaleb(-4)  # ±2% in 1bp steps
+        new_price = position.current_price * (1 + price_change)
         
         position.current_price = new_price
         
@@ -0,0 +1,51 @@
+"""
+Tests for the real-time analysis engine's indicator reuse
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.real_time_analysis_engine import RealTimeAnalysisEngine
+
+
+class _ListRedis:
+    """Just enough of redis.asyncio for get_price_ticks: newest-first lists"""
+    
+    def __init__(self):
+        self.lists = {}
+    
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+    
+    async def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:end + 1]
+
+
+_engine = RealTimeAnalysisEngine()
+
+
+def test_same_second_ticks_recompute_indicators():
+    engine = _engine
+    engine.redis = _ListRedis()
+    engine.price_window = 30
+    engine._ind_cache.clear()
+    key = "rt:prices:BTCUSDT:binance"
+    for second in range(30):
+        engine.redis.lpush(key, f"{1000 + second},{100 + second % 3}")
+    
+    first = asyncio.run(engine.compute_symbol_indicators("BTCUSDT"))
+    assert asyncio.run(engine.compute_symbol_indicators("BTCUSDT")) is first
+    
+    # Two more ticks in the same whole second, at different prices
+    engine.redis.lpush(key, "1030,110")
+    second = asyncio.run(engine.compute_symbol_indicators("BTCUSDT"))
+    assert second is not first
+    assert second["price"] == 110
+    
+    engine.redis.lpush(key, "1030,90")
+    third = asyncio.run(engine.compute_symbol_indicators("BTCUSDT"))
+    assert third is not second
+    assert third["price"] == 90
@@ -0,0 +1,60 @@
+"""
+Tests for the strategy engine's cached kline windows
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from services.strategy_engine import CLOSE, OHLCV_COLUMNS, RollingStats, _KlineWindow, _momentum_kernel
+
+
+def _window(closes):
+    count = len(closes)
+    ids = np.arange(1, count + 1)
+    times = np.datetime64("2024-01-01T00:00", "us") + np.arange(count) * np.timedelta64(1, "h")
+    data = np.tile(np.asarray(closes, dtype=np.float64), (len(OHLCV_COLUMNS), 1))
+    return _KlineWindow(ids, times, data, close_stats=RollingStats.from_values(data[CLOSE]))
+
+
+def test_merge_refreshes_upserted_open_candle():
+    window = _window([1.0, 1.1, 1.2])
+    ids, times, data = window.ids[-1:].copy(), window.times[-1:].copy(), window.data[:, -1:].copy()
+    data[:] = 1.5
+    
+    window.merge(ids, times, data)
+    
+    assert window.bars["close"].tolist() == [1.0, 1.1, 1.5]
+    assert window.bars["volume"][-1] == 1.5
+    assert len(window.ids) == 3
+    assert window.close_stats.count == 3
+    assert np.isclose(window.close_stats.mean, np.mean([1.0, 1.1, 1.5]))
+    assert np.isclose(window.close_stats.std, np.std([1.0, 1.1, 1.5]))
+
+
+def test_merge_appends_new_rows_and_refreshes_overlap():
+    window = _window([1.0, 1.1, 1.2])
+    ids = np.array([3, 4])
+    times = window.times[-1] + np.arange(2) * np.timedelta64(1, "h")
+    data = np.tile(np.array([1.3, 1.4]), (len(OHLCV_COLUMNS), 1))
+    
+    window.merge(ids, times, data)
+    
+    assert window.ids.tolist() == [1, 2, 3, 4]
+    assert window.bars["close"].tolist() == [1.0, 1.1, 1.3, 1.4]
+    assert np.isclose(window.close_stats.mean, np.mean([1.0, 1.1, 1.3, 1.4]))
+
+
+def test_momentum_kernel_zero_volume():
+    prices = np.linspace(100.0, 110.0, 30)
+    volumes = np.zeros(30)
+    # py_func is the plain-Python kernel that runs when numba is not installed
+    kernels = [getattr(_momentum_kernel, "py_func", _momentum_kernel), _momentum_kernel]
+    
+    for kernel in kernels:
+        price_momentum, volume_momentum = kernel(prices, volumes, 20, 5)
+        assert np.isclose(price_momentum, prices[-1] / prices[-20] - 1)
+        assert volume_momentum == 0.0
@@ -519,6 +519,9 @@ class BinanceWebSocketService:
 
         Key: rt:prices:{symbol}:{exchange}
         Value: "{epoch_sec},{price}"
+
+        The same value is published on rt:tick:{symbol} so the analysis
+        engine can react to new ticks instead of polling.
         """
         try:
             import time as _t
@@ -530,6 +533,7 @@ class BinanceWebSocketService:
             pipe.ltrim(key, 0, max_len - 1)
             # Set an expiry to auto-cleanup inactive series
             pipe.expire(key, max(3600, max_len))
+            pipe.publish(f"rt:tick:{symbol}", val)
             await pipe.execute()
         except Exception as e:
             logger.error("Failed to update realtime series", error=str(e))
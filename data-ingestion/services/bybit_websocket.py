@@ -411,6 +411,7 @@ class BybitWebSocketService:
             pipe.lpush(key, val)
             pipe.ltrim(key, 0, max_len - 1)
             pipe.expire(key, max(3600, max_len))
+            pipe.publish(f"rt:tick:{symbol}", val)
             await pipe.execute()
         except Exception as e:
             logger.error("Bybit realtime series failed", error=str(e))
@@ -57,6 +57,7 @@ class KucoinPoller:
         pipe.lpush(key, val)
         pipe.ltrim(key, 0, max_len - 1)
         pipe.expire(key, max(3600, max_len))
+        pipe.publish(f"rt:tick:{symbol}", val)
         await pipe.execute()
 
     async def run(self) -> None:
@@ -131,6 +131,7 @@ class MultiExchangePoller:
             pipe.lpush(key, json.dumps(data))
             pipe.ltrim(key, 0, 3600)  # Keep 1 hour of data
             pipe.expire(key, 7200)  # Expire after 2 hours
+            pipe.publish(f"rt:tick:{symbol}", f"{timestamp},{price}")  # Wake the analysis engine
             await pipe.execute()
             
         except Exception as e: